@@ -0,0 +1,269 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+# Window key used by sources that only ever see one meeting
+DEFAULT_WINDOW_KEY = "main"
+
+
+class CaptionSource:
+    """Base interface for anything that can feed (speaker, text) frames to the sensor."""
+
+    requires_uia = False
+
+    def __init__(self):
+        self.window_name = "Buscando Teams..."
+
+    def read(self):
+        # Returns the caption currently on screen as (speaker, text) or (None, None)
+        raise NotImplementedError
+
+    def read_windows(self):
+        # Every meeting window in one pass: {window_key: (window_name, speaker, text)}
+        speaker, text = self.read()
+        return {DEFAULT_WINDOW_KEY: (self.window_name, speaker, text)}
+
+    def now(self):
+        # Clock used by the sensor for silence timeouts and block timestamps
+        return time.time()
+
+    def wait(self, interval):
+        # Pause between polls; replay sources override this to run in virtual time
+        time.sleep(interval)
+
+    def wait_for_change(self, notifier, timeout):
+        # Event-driven pause: sleeps on the notifier, so the clock moves on its own
+        return notifier.wait(timeout)
+
+    @property
+    def exhausted(self):
+        # Live sources never run out of frames
+        return False
+
+    @property
+    def watch_targets(self):
+        # Elements a CaptionChangeNotifier should subscribe to
+        return ()
+
+    def close(self):
+        pass
+
+
+class WindowFeed(CaptionSource):
+    """Per-window view of a multi-window source, fed once per tick by the capture loop."""
+
+    def __init__(self, parent, window_key):
+        super().__init__()
+        self.parent = parent
+        self.window_key = window_key
+        self.frame = (None, None)
+
+    def push(self, window_name, speaker, text):
+        if window_name:
+            self.window_name = window_name
+        self.frame = (speaker, text)
+
+    def read(self):
+        return self.frame
+
+    def now(self):
+        return self.parent.now()
+
+
+class RecordingCaptionSource(CaptionSource):
+    """Wraps another source and saves every distinct frame to a gzip JSONL file."""
+
+    def __init__(self, inner, path):
+        super().__init__()
+        self.inner = inner
+        self.requires_uia = inner.requires_uia
+        self.path = path
+        self.start_ts = inner.now()
+        self.last_frames = {}
+        self.last_windows = {}
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"v": 1, "start": self.start_ts})
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+
+    def _record(self, window_key, window_name, speaker, text):
+        # Only changes are stored; replay repeats the last frame between entries
+        frame = (speaker, text)
+        window_changed = window_name != self.last_windows.get(window_key)
+        if frame == self.last_frames.get(window_key) and not window_changed:
+            return
+        record = {
+            "t": round(self.inner.now() - self.start_ts, 3),
+            "s": speaker,
+            "x": text,
+        }
+        if window_key != DEFAULT_WINDOW_KEY:
+            record["k"] = window_key
+        if window_changed:
+            record["w"] = window_name
+            self.last_windows[window_key] = window_name
+        self._write(record)
+        self.last_frames[window_key] = frame
+
+    def read(self):
+        speaker, text = self.inner.read()
+        self.window_name = self.inner.window_name
+        self._record(DEFAULT_WINDOW_KEY, self.window_name, speaker, text)
+        return speaker, text
+
+    def read_windows(self):
+        frames = self.inner.read_windows()
+        for window_key, (window_name, speaker, text) in frames.items():
+            self._record(window_key, window_name, speaker, text)
+        return frames
+
+    def now(self):
+        return self.inner.now()
+
+    def wait(self, interval):
+        self.inner.wait(interval)
+
+    def wait_for_change(self, notifier, timeout):
+        return self.inner.wait_for_change(notifier, timeout)
+
+    @property
+    def exhausted(self):
+        return self.inner.exhausted
+
+    @property
+    def watch_targets(self):
+        return self.inner.watch_targets
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self.inner.close()
+
+
+class ReplayCaptionSource(CaptionSource):
+    """
+    Feeds back a recording made by RecordingCaptionSource.
+
+    speed=1 replays in real time, speed=N runs N times faster and speed=0
+    runs as fast as possible. In every mode the clock advances in virtual
+    time so silence timeouts and block timestamps match the original meeting.
+    """
+
+    def __init__(self, path, speed=0):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.start_ts, self.frames = self._load(path)
+
+        self.position = 0
+        self.virtual_time = 0.0
+        self.current = {}  # window_key -> [window_name, speaker, text]
+
+    @staticmethod
+    def _load(path):
+        frames = []
+        start_ts = 0.0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "start" in record:
+                    start_ts = record["start"]
+                    continue
+                frames.append(
+                    (
+                        record["t"],
+                        record.get("k", DEFAULT_WINDOW_KEY),
+                        record["s"],
+                        record["x"],
+                        record.get("w"),
+                    )
+                )
+        return start_ts, frames
+
+    def read_windows(self):
+        # Advance to the last frame visible at the current virtual time
+        while (
+            self.position < len(self.frames)
+            and self.frames[self.position][0] <= self.virtual_time
+        ):
+            _, window_key, speaker, text, window = self.frames[self.position]
+            state = self.current.setdefault(window_key, [self.window_name, None, None])
+            if window is not None:
+                state[0] = window
+            state[1], state[2] = speaker, text
+            self.position += 1
+        return {key: tuple(state) for key, state in self.current.items()}
+
+    def read(self):
+        # Single-window view: first window showing a caption
+        for window_name, speaker, text in self.read_windows().values():
+            if text:
+                self.window_name = window_name
+                return speaker, text
+        return None, None
+
+    def now(self):
+        return self.start_ts + self.virtual_time
+
+    def wait(self, interval):
+        self.virtual_time += interval
+        if self.speed:
+            time.sleep(interval / self.speed)
+
+    def wait_for_change(self, notifier, timeout):
+        # A live notifier would fire when the next recorded frame appears, so
+        # virtual time jumps there (at most `timeout`); pending events are consumed
+        fired = notifier.wait(0)
+        step = timeout
+        if not self.exhausted:
+            step = min(timeout, self.frames[self.position][0] - self.virtual_time)
+        self.wait(max(step, 0.0))
+        return fired or step < timeout
+
+    @property
+    def exhausted(self):
+        return self.position >= len(self.frames)
+
+    @property
+    def duration(self):
+        return self.frames[-1][0] if self.frames else 0.0
+
+
+class CaptionChangeNotifier:
+    """
+    Push-side companion of a CaptionSource: wakes the capture loop when a
+    caption subtree changes so it does not have to poll on a fixed interval.
+
+    Concrete notifiers subscribe in watch() and call notify() from their
+    event callbacks; tests can drive notify() directly as a fake emitter.
+    """
+
+    def __init__(self):
+        self._changed = threading.Event()
+
+    def watch(self, targets):
+        # Keeps subscriptions in sync with targets; True while events cover all of them
+        return False
+
+    def notify(self):
+        self._changed.set()
+
+    def wait(self, timeout):
+        # Blocks until a change arrives or the fallback timeout expires
+        fired = self._changed.wait(timeout)
+        self._changed.clear()
+        return fired
+
+    def close(self):
+        pass
@@ -0,0 +1,169 @@
+import re
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+
+FUZZY_CACHE_SIZE = 4096  # Distinct lowercase words remembered across blocks
+
+VERSION_PATTERN = r"\b[bB]\s?[\-]?\s?(?P<ver_num>\d+)\b"
+
+
+def _trie_regex(words):
+    # Factor shared prefixes so the regex engine walks a trie instead of trying
+    # every alias at every position. Optional tails are greedy, so the longest
+    # alias wins, like the old per-term patterns sorted by length.
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class GlossaryScan:
+    """Result of one pass over a text: cleaned text plus every hit found."""
+
+    def __init__(self, clean_text, versions, terms):
+        self.clean_text = clean_text
+        self.versions = versions  # Version numbers in order of appearance
+        self.terms = terms  # Canonical glossary terms, in glossary order
+
+
+class GlossaryEngine:
+    """
+    Compiles every alias in technical_glossary.json into one pattern.
+
+    A single re.sub pass fixes "b 1" style versions, replaces live_replace
+    aliases and records which terms appeared, so live cleanup and AI hints
+    cost one scan regardless of glossary size.
+    """
+
+    def __init__(self, glossary_data):
+        self.glossary_data = glossary_data
+        self.alias_to_term = {}
+        self.live_terms = set()
+        self.term_order = {}
+
+        for index, (correct_word, data) in enumerate(glossary_data.items()):
+            self.term_order[correct_word] = index
+            if data.get("live_replace", False):
+                self.live_terms.add(correct_word)
+            for alias in data.get("aliases", []):
+                # First term that declares an alias keeps it, as the old rule order did
+                self.alias_to_term.setdefault(alias.lower(), correct_word)
+
+        alternatives = [f"(?P<ver>{VERSION_PATTERN})"]
+        if self.alias_to_term:
+            alternatives.append(rf"\b(?P<term>{_trie_regex(self.alias_to_term)})\b")
+        self.pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def scan(self, text):
+        versions = []
+        found_terms = set()
+
+        def dispatch(match):
+            if match.group("ver") is not None:
+                num = match.group("ver_num")
+                if num not in versions:
+                    versions.append(num)
+                # "b 1" can also be a declared alias (of v1); keep its term hint
+                correct = self.alias_to_term.get(match.group("ver").lower())
+                if correct is not None:
+                    found_terms.add(correct)
+                return f"v{num}"
+
+            alias = match.group("term")
+            correct = self.alias_to_term.get(alias.lower())
+            if correct is None:
+                return alias
+            found_terms.add(correct)
+            return correct if correct in self.live_terms else alias
+
+        clean = self.pattern.sub(dispatch, text) if text else ""
+        terms = sorted(found_terms, key=self.term_order.get)
+        return GlossaryScan(clean, versions, terms)
+
+    def clean(self, text):
+        return self.scan(text).clean_text
+
+
+class FuzzyTermIndex:
+    """
+    Finds glossary keys that SequenceMatcher(None, word, key).ratio() puts at
+    or above a threshold without comparing every word with every key.
+
+    ratio = 2*M / (len(word) + len(key)) and M <= min(len(word), len(key)),
+    so only keys inside a length window can pass. Within the window a shared
+    character count (the quick_ratio bound) discards most keys before the
+    exact ratio runs. Results are cached per lowercase word across blocks.
+    """
+
+    def __init__(self, keys, threshold, cache_size=FUZZY_CACHE_SIZE):
+        self.threshold = threshold
+        self.buckets = {}
+        for key in keys:
+            lowered = key.lower()
+            matcher = SequenceMatcher(None)
+            matcher.set_seq2(lowered)  # Indexing of b is reused for every word
+            entry = (key, lowered, Counter(lowered), matcher)
+            self.buckets.setdefault(len(lowered), []).append(entry)
+        self.lengths = sorted(self.buckets)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+
+    def _length_window(self, length):
+        # 2*min(a, b) / (a + b) >= threshold bounds the key length
+        if self.threshold <= 0:
+            return self.lengths
+        ratio = self.threshold / (2 - self.threshold)
+        low, high = length * ratio - 1e-9, length / ratio + 1e-9
+        return [size for size in self.lengths if low <= size <= high]
+
+    def _match_lowered(self, word):
+        hits = []
+        total_needed = self.threshold / 2
+        counts = None
+        for size in self._length_window(len(word)):
+            needed = total_needed * (len(word) + size)
+            for key, lowered, key_counts, matcher in self.buckets[size]:
+                if lowered == word:
+                    continue
+                if counts is None:
+                    counts = Counter(word)
+                if sum((counts & key_counts).values()) < needed - 1e-9:
+                    continue
+                matcher.set_seq1(word)
+                if matcher.ratio() >= self.threshold:
+                    hits.append(key)
+        return tuple(hits)
+
+    def match(self, word):
+        lowered = word.lower()
+        hits = self.cache.get(lowered)
+        if hits is not None:
+            self.cache.move_to_end(lowered)
+            return hits
+        hits = self._match_lowered(lowered)
+        self.cache[lowered] = hits
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return hits
+
+    def scan(self, words):
+        matches = set()
+        for word in dict.fromkeys(words):  # Each distinct word once per block
+            for key in self.match(word):
+                matches.add((word, key))
+        return matches
@@ -16,8 +16,11 @@ COLORS = {
     "led_on": "#2ecc71",
     "led_off": "#e74c3c",
     "led_process": "#3498db",
+    "led_warn": "#f1c40f",
 }
 
+LIVE_PANEL_LINES = 8
+
 
 def ask_config_gui():
     """Ventana modal de configuración inicial de idiomas"""
@@ -172,6 +175,7 @@ class MeetCopilotApp(tk.Tk):
         self.led_sensor = self.create_led(footer_frame, "SENSOR")
         self.led_trans = self.create_led(footer_frame, "TRANS")
         self.led_ai = self.create_led(footer_frame, "AI")
+        self.ai_breaker_state = "closed"
 
         # Checkbox visual para Auto-Scroll
         tk.Checkbutton(
@@ -249,6 +253,15 @@ class MeetCopilotApp(tk.Tk):
         color = COLORS["led_on"] if status else COLORS["border"]
         canvas.itemconfig(led, fill=color)
 
+    def show_ai_breaker(self, breaker_state):
+        """LED de IA: rojo si LM Studio no responde, amarillo mientras se prueba."""
+        self.ai_breaker_state = breaker_state
+        canvas, led = self.led_ai
+        color = {"open": COLORS["led_off"], "half_open": COLORS["led_warn"]}.get(
+            breaker_state, COLORS["border"]
+        )
+        canvas.itemconfig(led, fill=color)
+
     def create_text_area(self, parent, text_color, row):
         txt = scrolledtext.ScrolledText(
             parent,
@@ -303,6 +316,44 @@ class MeetCopilotApp(tk.Tk):
         else:
             self.txt_ai.delete("1.0", tk.END)
 
+    def apply_live_delta(self, delta):
+        """Aplica solo las líneas nuevas y la línea activa al panel en vivo."""
+        txt = self.txt_live
+        if "live_active" not in txt.mark_names():
+            txt.mark_set("live_active", "1.0")
+            txt.mark_gravity("live_active", tk.LEFT)
+
+        # Cambio de ventana de reunión: se repinta el panel completo
+        if delta.get("reset"):
+            txt.delete("1.0", tk.END)
+            txt.mark_set("live_active", "1.0")
+
+        # Quitar la línea activa anterior, agregar las confirmadas y la nueva activa
+        txt.delete("live_active", tk.END)
+        for line in delta["committed"]:
+            txt.insert(tk.END, line + "\n")
+        txt.mark_set("live_active", "end-1c")
+        txt.insert(tk.END, delta["active"])
+
+        # Mantener el panel acotado: líneas confirmadas + línea activa
+        total_lines = int(txt.index("end-1c").split(".")[0])
+        excess = total_lines - (LIVE_PANEL_LINES + 1)
+        if excess > 0:
+            txt.delete("1.0", f"{excess + 1}.0")
+
+    def apply_ai_partial(self, delta):
+        """Escribe los tokens de la minuta en curso al inicio del panel IA."""
+        txt = self.txt_ai
+        if delta.get("reset"):
+            # Nueva entrada (o reintento): se descarta el texto parcial previo
+            if "ai_partial_end" in txt.mark_names():
+                txt.delete("1.0", "ai_partial_end")
+            txt.mark_set("ai_partial_end", "1.0")
+            txt.mark_gravity("ai_partial_end", tk.RIGHT)
+            txt.insert("ai_partial_end", delta["header"])
+        if delta["text"] and "ai_partial_end" in txt.mark_names():
+            txt.insert("ai_partial_end", delta["text"])
+
     def check_queue(self):
         try:
             while True:
@@ -314,6 +365,12 @@ class MeetCopilotApp(tk.Tk):
                     if self.auto_scroll.get():
                         self.txt_live.see(tk.END)
 
+                elif action == "live_delta":
+                    self.update_led(self.led_sensor, True)
+                    self.apply_live_delta(data)
+                    if self.auto_scroll.get():
+                        self.txt_live.see(tk.END)
+
                 elif action == "trans":
                     self.update_led(self.led_trans, True)
                     self.txt_trans.delete("1.0", tk.END)
@@ -321,14 +378,32 @@ class MeetCopilotApp(tk.Tk):
                     if self.auto_scroll.get():
                         self.txt_trans.see(tk.END)
 
+                elif action == "ai_partial":
+                    self.update_led(self.led_ai, True)
+                    self.apply_ai_partial(data)
+
                 elif action == "ai_new":
                     self.update_led(self.led_ai, True)
+                    # La entrada final reemplaza al texto parcial del streaming
+                    if "ai_partial_end" in self.txt_ai.mark_names():
+                        self.txt_ai.delete("1.0", "ai_partial_end")
+                        self.txt_ai.mark_unset("ai_partial_end")
                     self.txt_ai.insert("1.0", data + "\n")
-                    self.after(1000, lambda: self.update_led(self.led_ai, False))
+                    self.after(
+                        1000, lambda: self.show_ai_breaker(self.ai_breaker_state)
+                    )
+
+                elif action == "ai_breaker":
+                    self.show_ai_breaker(data)
+                    if data == "open":
+                        self.log_var.set("IA sin conexión: bloques en espera")
 
                 elif action == "status":
                     self.header_var.set(data)
 
+                elif action == "sensor_stats":
+                    self.log_var.set(data)
+
                 elif action == "shutdown_complete":
                     self.destroy()
         except queue.Empty:
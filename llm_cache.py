@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed store of LLM answers on disk.
+
+    The key covers the model, the system prompt (its hash is the prompt
+    version), the sampling parameters and the payload, so any change to one
+    of them is a miss. Entries live in <folder>/<2 hex>/<hash>.json; hits
+    refresh the file mtime and the oldest files are evicted once the folder
+    grows past max_bytes.
+    """
+
+    def __init__(self, folder, max_bytes, enabled=True):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.total_bytes = None  # Measured lazily on the first write
+
+    def key(self, model, messages, **params):
+        system = "".join(m["content"] for m in messages if m["role"] == "system")
+        payload = [m for m in messages if m["role"] != "system"]
+        material = {
+            "model": model,
+            "prompt_version": _sha256(system),
+            "params": params,
+            "payload": _sha256(json.dumps(payload, ensure_ascii=False)),
+        }
+        return _sha256(json.dumps(material, sort_keys=True))
+
+    def _path(self, key):
+        return os.path.join(self.folder, key[:2], f"{key}.json")
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = json.load(f)["content"]
+            os.utime(path)  # Recently used entries survive eviction
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return content
+
+    def contains(self, key):
+        # Presence only: does not count as a hit or refresh the entry
+        return self.enabled and os.path.exists(self._path(key))
+
+    def put(self, key, content, **meta):
+        if not self.enabled or not content:
+            return
+        path = self._path(key)
+        record = dict(meta, content=content, created=time.time())
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        for root, _, names in os.walk(self.folder):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        # Least recently used first, down to 90% of the limit
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
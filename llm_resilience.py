@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the server while the breaker is open."""
+
+
+def is_retryable(error):
+    # A 4xx answer (bad request, context too long...) fails the same way every
+    # time; only timeouts, conflicts and rate limits are worth sending again
+    status = getattr(error, "status_code", None)
+    return status is None or status >= 500 or status in (408, 409, 429)
+
+
+def backoff_delay(attempt, base, cap):
+    # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """
+    Stops hammering the LLM server once it keeps failing.
+
+    closed: calls go through; failure_threshold consecutive failures open it.
+    open: calls fail fast with CircuitOpenError. After reset_timeout a cheap
+    health probe runs; if it answers, the breaker goes half_open.
+    half_open: a single trial call goes through; success closes the breaker,
+    failure opens it again with a doubled timeout (up to max_reset_timeout).
+    """
+
+    def __init__(
+        self,
+        failure_threshold=3,
+        reset_timeout=5.0,
+        max_reset_timeout=60.0,
+        on_state_change=None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.on_state_change = on_state_change
+
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.reset_timeout = reset_timeout
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def _set_state(self, state):
+        # Caller holds the lock
+        if state == self.state:
+            return
+        self.state = state
+        if self.on_state_change:
+            self.on_state_change(state)
+
+    def allow(self, probe=None):
+        with self.lock:
+            if self.state == BREAKER_CLOSED:
+                return True
+            if self.state == BREAKER_HALF_OPEN:
+                if self.trial_running:
+                    return False
+                self.trial_running = True
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Claim the probe so only one thread pings the server
+            self.opened_at = time.monotonic()
+
+        healthy = True
+        if probe is not None:
+            try:
+                probe()
+            except Exception:
+                healthy = False
+
+        with self.lock:
+            if not healthy:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+                return False
+            self._set_state(BREAKER_HALF_OPEN)
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.trial_running = False
+            self.reset_timeout = self.base_reset_timeout
+            self._set_state(BREAKER_CLOSED)
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            trial_failed = self.state == BREAKER_HALF_OPEN
+            self.trial_running = False
+            if trial_failed:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+            if trial_failed or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(BREAKER_OPEN)
+
+    @property
+    def is_closed(self):
+        return self.state == BREAKER_CLOSED
+
+
+def call_with_retry(
+    func,
+    breaker,
+    probe=None,
+    attempts=3,
+    base_delay=1.0,
+    max_delay=20.0,
+    on_retry=None,
+):
+    """
+    Runs func() with exponential backoff and jitter between attempts.
+
+    Fails fast with CircuitOpenError when the breaker refuses the call, so
+    callers can park the work and retry once the server is back. Errors that
+    is_retryable() rejects are raised at once and do not count as failures.
+    """
+    for attempt in range(attempts):
+        if not breaker.allow(probe):
+            raise CircuitOpenError("LLM server unavailable (circuit open)")
+        try:
+            result = func()
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.record_success()  # The server answered; the request is bad
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+            if on_retry:
+                on_retry(attempt)
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            continue
+        breaker.record_success()
+        return result
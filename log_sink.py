@@ -0,0 +1,164 @@
+import os
+import queue
+import threading
+import time
+
+DURABILITY_NONE = "none"  # Buffered; the OS decides when data reaches the disk
+DURABILITY_GROUP = "group"  # fsync dirty files at most every group_commit_ms
+DURABILITY_BLOCK = "block"  # fsync after every record marked commit=True
+
+
+class _Barrier:
+    def __init__(self, close_folder):
+        self.close_folder = close_folder
+        self.done = threading.Event()
+
+
+class LogSink:
+    """
+    Single writer thread for the meeting log files.
+
+    Callers only enqueue (path, text) records; the writer keeps the handles
+    open, writes whatever is queued in one batch and flushes when the queue
+    runs dry, so the logs stay readable while the meeting runs. barrier()
+    waits until everything queued before it is on disk and can close the
+    handles of a folder before it is renamed.
+    """
+
+    def __init__(self, durability=DURABILITY_GROUP, group_commit_ms=500, on_error=None):
+        self.durability = durability
+        self.group_commit = group_commit_ms / 1000.0
+        self.on_error = on_error
+        self.records = queue.Queue()
+        self.handles = {}  # path -> open file
+        self.dirty = set()  # Paths written since the last fsync
+        self.last_commit = time.monotonic()
+        self.thread = None
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        with self.start_lock:
+            self._ensure_thread()
+        return self
+
+    def _ensure_thread(self):
+        # Caller holds start_lock
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _put(self, record):
+        # Under the lock so nothing lands behind close() on a dying thread
+        with self.start_lock:
+            self._ensure_thread()
+            self.records.put(record)
+
+    def write(self, path, text, truncate=False, commit=False):
+        # truncate: start the file over (headers); commit: end of a block
+        self._put((path, text, truncate, commit))
+
+    def barrier(self, close_folder=None, timeout=None):
+        # Blocks until every earlier record is written and fsynced
+        barrier = _Barrier(close_folder)
+        self._put(barrier)
+        return barrier.done.wait(timeout)
+
+    def close(self, timeout=None):
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                return
+            self.records.put(None)
+            self.thread.join(timeout)
+
+    def _report(self, error):
+        if self.on_error:
+            self.on_error(error)
+
+    def _handle(self, path, truncate):
+        f = self.handles.get(path)
+        if f is not None and not truncate:
+            return f
+        if f is not None:
+            f.close()
+        f = open(path, "w" if truncate else "a", encoding="utf-8")
+        self.handles[path] = f
+        return f
+
+    def _sync(self):
+        for path in list(self.dirty):
+            f = self.handles.get(path)
+            try:
+                if f is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self._report(e)
+        self.dirty.clear()
+        self.last_commit = time.monotonic()
+
+    def _flush(self):
+        for f in self.handles.values():
+            try:
+                f.flush()
+            except OSError as e:
+                self._report(e)
+
+    def _close_files(self, folder=None):
+        inside = os.path.join(folder, "") if folder else ""
+        for path in list(self.handles):
+            if path.startswith(inside):
+                try:
+                    self.handles.pop(path).close()
+                except OSError as e:
+                    self._report(e)
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self.dirty and self.durability == DURABILITY_GROUP:
+                timeout = max(
+                    0.0, self.last_commit + self.group_commit - time.monotonic()
+                )
+            try:
+                record = self.records.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                continue
+
+            # Drain everything already queued as one batch
+            batch = [record]
+            while True:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is None:
+                    self._sync()
+                    self._close_files()
+                    return
+                if isinstance(record, _Barrier):
+                    self._sync()
+                    if record.close_folder:
+                        self._close_files(record.close_folder)
+                    record.done.set()
+                    continue
+                path, text, truncate, commit = record
+                try:
+                    self._handle(path, truncate).write(text)
+                except OSError as e:
+                    self._report(e)
+                    continue
+                self.dirty.add(path)
+                if commit and self.durability == DURABILITY_BLOCK:
+                    self._sync()
+
+            self._flush()
+            if (
+                self.durability == DURABILITY_GROUP
+                and time.monotonic() - self.last_commit >= self.group_commit
+            ):
+                self._sync()
+            elif self.durability == DURABILITY_NONE:
+                self.dirty.clear()
@@ -1,9 +1,12 @@
 import os
 import queue
 import re
+import shutil
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
 from openai import OpenAI
@@ -11,7 +14,27 @@ from openai import OpenAI
 import prompts
 import realtime_translator as rt
 import teams_stream_capture as tsc
+import token_budget
+from caption_sources import DEFAULT_WINDOW_KEY, RecordingCaptionSource
 from gui_module import MeetCopilotApp, ask_config_gui
+from llm_cache import ResponseCache
+from llm_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    call_with_retry,
+    is_retryable,
+)
+from log_sink import LogSink
+from meeting_journal import (
+    RECORD_FINAL,
+    RECORD_MEETING,
+    RECORD_MINUTE,
+    RECORD_PACKET,
+    MeetingJournal,
+    unfinished_journals,
+)
+from search_index import SearchIndexWriter
+from transcript_archive import ArchiveError, archive_meeting, meeting_log_files
 
 # === CONFIGURATION ===
 LM_STUDIO_URL = "http://localhost:1234/v1"
@@ -19,7 +42,61 @@ MODEL_NAME = "local-model"
 OUTPUT_DIR = "reuniones_logs"
 
 MAX_RETRIES = 3
-RETRY_DELAY = 5
+
+# Resilience: jittered exponential backoff between attempts and a circuit
+# breaker that stops calling LM Studio while it is down or reloading a model
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 20.0
+BREAKER_FAILURES = 3
+BREAKER_RESET_SECONDS = 5.0
+SHUTDOWN_RETRY_GRACE = 60  # Seconds to wait for the server before parked blocks fail
+
+# Saves raw caption frames next to the logs so sessions can be replayed offline
+RECORD_CAPTION_FRAMES = False
+
+# Segment minutes are streamed token by token into the AI panel
+STREAM_SEGMENT_MINUTES = True
+
+# Segment requests kept in flight at once (match the LM Studio parallel slots)
+AI_MAX_IN_FLIGHT = 2
+
+# Rolling executive summary: each update folds at most this many characters of
+# new minutes into a report capped at ROLLING_SUMMARY_MAX_TOKENS
+ROLLING_SUMMARY_CHUNK_CHARS = 6000
+ROLLING_SUMMARY_MAX_TOKENS = 1200
+
+# Queued blocks of the same meeting are merged into one request up to this many
+# payload tokens (None = the model payload budget)
+COALESCE_TOKEN_BUDGET = None
+
+# Tokens of the executive summary sent to the meeting-name suggestion
+NAME_SUGGESTION_TOKENS = 600
+
+# On-disk cache of LLM answers, keyed by model, prompt, parameters and payload.
+# Set LLM_CACHE_ENABLED = False to always go to the server.
+LLM_CACHE_ENABLED = True
+LLM_CACHE_DIR = os.path.join(OUTPUT_DIR, ".llm_cache")
+LLM_CACHE_MAX_MB = 200
+
+# Meeting files are written by one background thread that keeps them open.
+# Durability: "none" (OS buffered), "group" (fsync every LOG_GROUP_COMMIT_MS)
+# or "block" (fsync after every minute, the slowest and safest)
+LOG_DURABILITY = "group"
+LOG_GROUP_COMMIT_MS = 500
+
+# Journal of captured blocks and written minutes; meetings of a run that died
+# are resumed from it on the next start
+JOURNAL_DIR = os.path.join(OUTPUT_DIR, ".journal")
+
+# The forensic, live and AI input logs of finalized meetings are packed into
+# one compressed _TRANSCRIPT.mcarch by a background pass at the next start, so
+# closing the app never waits on it (utils/archive_meetings.py reads it back)
+ARCHIVE_TRANSCRIPTS = True
+
+# Full-text index (SQLite FTS5) with one row per block across all meetings,
+# updated as minutes are written; query it with utils/search_meetings.py
+SEARCH_INDEX_ENABLED = True
+SEARCH_INDEX_PATH = os.path.join(OUTPUT_DIR, ".search", "meetings.sqlite3")
 
 
 class AppState:
@@ -38,9 +115,34 @@ text_process_queue = queue.Queue()
 ai_stop_event = threading.Event()
 capture_stop_event = threading.Event()
 
+llm_breaker = CircuitBreaker(
+    BREAKER_FAILURES,
+    BREAKER_RESET_SECONDS,
+    on_state_change=lambda breaker_state: gui_queue.put(("ai_breaker", breaker_state)),
+)
+
+# Block size follows the AI backlog (queued + in-flight blocks) and latency
+segmentation = tsc.SegmentationPolicy(
+    backlog=lambda: text_process_queue.unfinished_tasks, slots=AI_MAX_IN_FLIGHT
+)
+llm_cache = ResponseCache(
+    LLM_CACHE_DIR, LLM_CACHE_MAX_MB * 1024 * 1024, LLM_CACHE_ENABLED
+)
+search_index = SearchIndexWriter(
+    SEARCH_INDEX_PATH,
+    SEARCH_INDEX_ENABLED,
+    on_error=lambda error: gui_queue.put(("status", f"⚠️ Search index: {error}")),
+)
+log_sink = LogSink(
+    LOG_DURABILITY,
+    LOG_GROUP_COMMIT_MS,
+    on_error=lambda error: gui_queue.put(("status", f"⚠️ Log write error: {error}")),
+)
+
 
 def get_llm_client():
-    return OpenAI(base_url=LM_STUDIO_URL, api_key="lm-studio")
+    # Retries belong to llm_call() and the breaker; SDK retries would multiply them
+    return OpenAI(base_url=LM_STUDIO_URL, api_key="lm-studio", max_retries=0)
 
 
 def sanitize_filename(name):
@@ -122,217 +224,1078 @@ def rename_meeting_complete(current_folder_path, old_name, new_name, fixed_times
         return current_folder_path
 
 
+def llm_call(client, func, on_retry=None):
+    # Shared retry policy; raises CircuitOpenError while LM Studio is down
+    return call_with_retry(
+        func,
+        llm_breaker,
+        probe=lambda: client.models.list(timeout=5),
+        attempts=MAX_RETRIES,
+        base_delay=RETRY_BASE_DELAY,
+        max_delay=RETRY_MAX_DELAY,
+        on_retry=on_retry,
+    )
+
+
 def suggest_meeting_name_with_ai(client, summary_text):
-    for attempt in range(MAX_RETRIES):
+    messages = [
+        {"role": "system", "content": prompts.MEETING_NAME_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": prompts.MEETING_NAME_USER_PROMPT
+            + token_budget.truncate_tokens(summary_text, NAME_SUGGESTION_TOKENS),
+        },
+    ]
+    key = llm_cache.key(MODEL_NAME, messages, temperature=0.2, max_tokens=30)
+    suggested = llm_cache.get(key)
+    if suggested is None:
         try:
-            response = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": prompts.MEETING_NAME_SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": prompts.MEETING_NAME_USER_PROMPT
-                        + summary_text[:2000],
-                    },
-                ],
-                temperature=0.2,
-                max_tokens=30,
-                timeout=20,
+            response = llm_call(
+                client,
+                lambda: client.chat.completions.create(
+                    model=MODEL_NAME,
+                    messages=messages,
+                    temperature=0.2,
+                    max_tokens=30,
+                    timeout=20,
+                ),
             )
-            suggested = response.choices[0].message.content.strip()
-            return suggested.strip("\"'") if suggested else None
         except Exception:
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(2)
-                continue
             return None
+        suggested = response.choices[0].message.content
+        llm_cache.put(key, suggested, model=MODEL_NAME, kind="name")
+    suggested = (suggested or "").strip()
+    return suggested.strip("\"'") if suggested else None
+
+
+def _stream_completion(client, messages, temperature, timeout, on_partial):
+    # Forwards each content delta as it arrives; returns (text, time to first token)
+    started = time.perf_counter()
+    ttft = None
+    parts = []
+    stream = client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages,
+        temperature=temperature,
+        timeout=timeout,
+        stream=True,
+    )
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        piece = chunk.choices[0].delta.content
+        if not piece:
+            continue
+        if ttft is None:
+            ttft = time.perf_counter() - started
+        parts.append(piece)
+        on_partial(piece)
+    return "".join(parts), ttft
 
 
-def process_smart_segment(client, full_payload):
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": prompts.SMART_SEGMENT_SYSTEM_PROMPT},
-                    {"role": "user", "content": full_payload},
-                ],
-                temperature=0.2,
-                timeout=45,
+def _segment_messages(full_payload, system_prompt=prompts.SMART_SEGMENT_SYSTEM_PROMPT):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": full_payload},
+    ]
+
+
+def segment_cache_key(packet):
+    # Cache key of a block's minute as a request of its own. Merged answers
+    # are stored under it too, so a block hits the cache however it was grouped.
+    messages = _segment_messages(packet.get("ai_payload", ""))
+    return llm_cache.key(MODEL_NAME, messages, temperature=0.2)
+
+
+def process_smart_segment(
+    client,
+    full_payload,
+    on_partial=None,
+    system_prompt=prompts.SMART_SEGMENT_SYSTEM_PROMPT,
+):
+    # Returns (minute_text, ttft_seconds); ttft is None for a cached minute.
+    # Raises when the server stays unavailable; ai_worker parks the block
+    # and sends it again later.
+    messages = _segment_messages(full_payload, system_prompt)
+    key = llm_cache.key(MODEL_NAME, messages, temperature=0.2)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        if on_partial is not None:
+            on_partial("", reset=True)
+            on_partial(cached)
+        return cached, None
+
+    def attempt():
+        if on_partial is not None:
+            # A retry starts the entry over in the panel
+            on_partial("", reset=True)
+            return _stream_completion(client, messages, 0.2, 45, on_partial)
+
+        started = time.perf_counter()
+        response = client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=messages,
+            temperature=0.2,
+            timeout=45,
+        )
+        # Without streaming the first token arrives with the whole answer
+        return response.choices[0].message.content, time.perf_counter() - started
+
+    def on_retry(attempt_index):
+        gui_queue.put(("status", f"⚠️ AI Retry {attempt_index + 1}/{MAX_RETRIES}..."))
+
+    minute_txt, ttft = llm_call(client, attempt, on_retry)
+    llm_cache.put(key, minute_txt, model=MODEL_NAME, kind="segment")
+    return minute_txt, ttft
+
+
+_SEGMENT_SPLIT = re.compile(r"^=== SEGMENTO (\d+) ===[ \t]*$", re.MULTILINE)
+
+
+def build_coalesced_payload(packets):
+    # One request for several consecutive blocks of a meeting: the first
+    # block's context, every segment with its own header and merged hints
+    first = packets[0]
+    hints = list(dict.fromkeys(h for p in packets for h in p.get("hints", [])))
+    sections = [
+        token_budget.PayloadSection(
+            "reunión", f"=== REUNIÓN: {first.get('meeting_name', '')} ==="
+        )
+    ]
+    if first.get("previous_context"):
+        sections.append(
+            token_budget.PayloadSection(
+                "contexto",
+                "--- CONTEXTO PREVIO ---",
+                f"...{first['previous_context']}",
+                priority=2,
+                keep="tail",
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                gui_queue.put(("status", f"⚠️ AI Retry {attempt + 1}/{MAX_RETRIES}..."))
-                time.sleep(RETRY_DELAY)
-                continue
-            return f"Error IA (Final): {str(e)}"
+        )
+    for index, packet in enumerate(packets, 1):
+        words = len(packet.get("raw_forensic", "").split())
+        sections.append(
+            token_budget.PayloadSection(
+                f"segmento {index}",
+                f"--- SEGMENTO {index} ({packet.get('ts', '00:00')}, {words} palabras) ---",
+                packet.get("raw_forensic", ""),
+                priority=1,
+            )
+        )
+    if hints:
+        sections.append(
+            token_budget.PayloadSection(
+                "sugerencias",
+                "\n--- SUGERENCIAS DEL SENSOR (GLOSARIO) ---",
+                "\n".join(hints),
+                priority=3,
+                keep="lines",
+            )
+        )
+    budget = COALESCE_TOKEN_BUDGET or token_budget.payload_budget(MODEL_NAME)
+    return token_budget.build_payload(sections, budget)
 
 
-def generate_final_summary(client, full_minutes_text):
-    gui_queue.put(("status", "🧠 Generando Resumen Final..."))
-    for attempt in range(MAX_RETRIES):
+def split_coalesced_minute(text, count):
+    # Per-segment minutes from a multi-segment answer; None if the markers are off
+    parts = _SEGMENT_SPLIT.split(text)
+    numbers = [int(n) for n in parts[1::2]]
+    if numbers != list(range(1, count + 1)):
+        return None
+    return [body.strip() for body in parts[2::2]]
+
+
+def fold_summary(client, summary_so_far, new_minutes_text, timeout=60):
+    # One incremental step: merges new minutes into the running executive report
+    messages = [
+        {"role": "system", "content": prompts.ROLLING_SUMMARY_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": f"--- REPORTE ACUMULADO ---\n{summary_so_far or '(vacío)'}\n\n"
+            f"--- NUEVAS MINUTAS ---\n{new_minutes_text}",
+        },
+    ]
+    params = {"temperature": 0.4, "max_tokens": ROLLING_SUMMARY_MAX_TOKENS}
+    key = llm_cache.key(MODEL_NAME, messages, **params)
+    summary = llm_cache.get(key)
+    if summary is None:
+        response = llm_call(
+            client,
+            lambda: client.chat.completions.create(
+                model=MODEL_NAME, messages=messages, timeout=timeout, **params
+            ),
+        )
+        summary = response.choices[0].message.content
+        llm_cache.put(key, summary, model=MODEL_NAME, kind="summary")
+    return summary
+
+
+class RollingSummary:
+    """
+    Executive report kept up to date in the background as minutes arrive.
+
+    Each update sends the current report plus a bounded chunk of new minutes,
+    so no call grows with meeting length and shutdown only has to fold the
+    last, partial chunk. Chunks are cut at the same minutes on every run, so
+    reprocessing an unchanged meeting folds the same inputs (cache hits).
+    """
+
+    def __init__(self, client, executor):
+        self.client = client
+        self.executor = executor
+        self.summary = ""
+        self.pending = []  # Minutes not folded into the summary yet
+        self.first_summary = ""  # Report after the first fold (the name source)
+        self.first_fold = threading.Event()  # Set once that fold ran or failed
+        self.running = False
+        self.idle = threading.Event()
+        self.idle.set()
+        self.lock = threading.Lock()
+
+    def add(self, minute_text):
+        with self.lock:
+            self.pending.append(minute_text[:ROLLING_SUMMARY_CHUNK_CHARS])
+            if self.running:
+                return
+            self.running = True
+            self.idle.clear()
+        self.executor.submit(self._run)
+
+    def _take_chunk(self, final=False):
+        # Oldest pending minutes up to the chunk budget (always at least one).
+        # Until the final fold a chunk is only taken once the next minute
+        # closes it, so the cut never depends on how far the server is behind.
+        size = count = 0
+        for minute in self.pending:
+            if count and size + len(minute) > ROLLING_SUMMARY_CHUNK_CHARS:
+                break
+            size += len(minute)
+            count += 1
+        if count == len(self.pending) and not final:
+            return []
+        chunk = self.pending[:count]
+        del self.pending[:count]
+        return chunk
+
+    def _folded(self, summary):
+        # Called with the lock held
+        self.summary = summary
+        if not self.first_fold.is_set():
+            self.first_summary = summary
+            self.first_fold.set()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                chunk = self._take_chunk()
+                if not chunk:
+                    self.running = False
+                    self.idle.set()
+                    return
+                summary_so_far = self.summary
+            try:
+                updated = fold_summary(self.client, summary_so_far, "".join(chunk))
+            except Exception as e:
+                if not is_retryable(e):
+                    # Rejected by the server: sending it again would fail the same way
+                    gui_queue.put(("status", f"⚠️ Resumen parcial omitido: {e}"))
+                    continue
+                updated = None
+            with self.lock:
+                if updated:
+                    self._folded(updated)
+                    continue
+                # Server busy or down: keep the minutes for the next attempt
+                self.pending[:0] = chunk
+                self.running = False
+                self.idle.set()
+                return
+
+    def finish(self):
+        # Waits for the background update, then folds whatever is left
+        self.idle.wait()
+        with self.lock:
+            self.running = True  # Keeps add() from racing the final reconcile
+        give_up_at = time.monotonic() + SHUTDOWN_RETRY_GRACE
         try:
-            response = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": prompts.FINAL_SUMMARY_SYSTEM_PROMPT},
-                    {"role": "user", "content": full_minutes_text},
-                ],
-                temperature=0.4,
-                timeout=120,
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                gui_queue.put(
-                    ("status", f"⚠️ Summary Retry {attempt + 1}/{MAX_RETRIES}...")
-                )
-                time.sleep(RETRY_DELAY * 2)
-                continue
-            return f"Error Resumen (Final): {str(e)}"
+            while True:
+                with self.lock:
+                    chunk = self._take_chunk(final=True)
+                if not chunk:
+                    return self.summary
+                try:
+                    updated = fold_summary(
+                        self.client, self.summary, "".join(chunk), timeout=120
+                    )
+                    with self.lock:
+                        self._folded(updated)
+                except CircuitOpenError:
+                    # Server down: wait for the breaker probe within the grace period
+                    with self.lock:
+                        self.pending[:0] = chunk
+                    if time.monotonic() > give_up_at:
+                        return f"{self.summary}\n\nError Resumen (Final): LM Studio no disponible"
+                    time.sleep(1)
+                except Exception as e:
+                    return f"{self.summary}\n\nError Resumen (Final): {str(e)}"
+        finally:
+            with self.lock:
+                self.running = False
+            self.first_fold.set()  # Wakes the name request even if no fold succeeded
+
+
+class MeetingSession:
+    """Output folder, files and minutes of one captured meeting window."""
+
+    def __init__(self, meeting_name, meeting_id=None, folder=None, start_time_str=None):
+        # folder/start_time_str reopen the output of a resumed meeting
+        self.meeting_id = meeting_id
+        self.name = meeting_name or "Meeting"
+        self.minute_count = 0  # Entries live in the minute file, not in memory
+        self.next_seq = None  # Next block sequence number to write
+        self.ready = {}  # seq -> finished SegmentJob waiting for its turn
+        self.rolling = None  # RollingSummary, attached when the meeting gets packets
+
+        if folder and os.path.isdir(folder):
+            self.start_time_str = start_time_str
+            self.folder = folder
+            self.files = generate_file_paths(self.folder, self.name)
+            self.header = f"# LOG - {self.name} - Start: {self.start_time_str}\n\n"
+            return
+
+        # Capture fixed start time for folder consistency
+        self.start_time_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.folder = setup_meeting_folder(self.name, self.start_time_str)
+        self.files = generate_file_paths(self.folder, self.name)
+
+        header = f"# LOG - {self.name} - Start: {self.start_time_str}\n\n"
+        self.header = header
+
+        # Init files
+        log_sink.write(self.files["forensic"], f"# RAW FORENSE {header}", truncate=True)
+        log_sink.write(self.files["live"], f"# LOG VIVO {header}", truncate=True)
+        log_sink.write(self.files["ai_input"], f"# AI INPUT {header}", truncate=True)
+        log_sink.write(
+            self.files["minuta"], f"# TECHNICAL MINUTE {header}", truncate=True
+        )
+
+
+class SegmentJob:
+    """
+    One request sent to the LLM for one block, or for several consecutive
+    queued blocks of the same meeting merged into a single call.
+    Tokens are buffered until the job is committed.
+    """
+
+    def __init__(self, session, packets, header, payload, prompt_tokens):
+        self.session = session
+        self.packets = packets
+        self.seq = packets[0].get("seq", 0)
+        self.header = header
+        self.payload = payload
+        self.input_header = ""  # AI input log header, written with the minute
+        self.prompt_tokens = prompt_tokens
+        self.parts = []
+        self.on_partial = None
+        self.future = None  # Set while the request runs
+        self.result = None  # (minute_text, ttft) once it succeeded
+        self.error = None  # Last failure while parked
+        self.started = time.perf_counter()
+
+    @property
+    def coalesced(self):
+        return len(self.packets) > 1
+
+
+# Minute files start with a two-line "# TECHNICAL MINUTE # LOG ..." header
+MINUTE_FILE_HEADER_LINES = 2
+
+
+def open_minute_entries(path):
+    # Binary handle positioned at the first minute entry
+    f = open(path, "rb")
+    for _ in range(MINUTE_FILE_HEADER_LINES):
+        f.readline()
+    return f
+
+
+def name_source(session):
+    # Text for the name suggestion: the report after the first fold, which
+    # covers the same minutes on every run (the first chunk, or the whole
+    # meeting when it is shorter), or the first minutes on disk if it failed
+    session.rolling.first_fold.wait()
+    if session.rolling.first_summary:
+        return session.rolling.first_summary
+    try:
+        with open_minute_entries(session.files["minuta"]) as f:
+            head = f.read(NAME_SUGGESTION_TOKENS * 8)
+    except OSError:
+        return ""
+    return head.decode("utf-8", errors="ignore")
+
+
+def suggest_session_name(client, session):
+    # Runs on the name executor: waits there for the first fold, if needed
+    return suggest_meeting_name_with_ai(client, name_source(session))
 
 
-def ai_worker(initial_meeting_name=None):
+def log_packets(files, packets):
+    # Forensic and live logs of the captured blocks
+    for packet in packets:
+        meta_header = packet.get("meta_header", "")
+        log_sink.write(
+            files["forensic"],
+            f"{meta_header}\n{packet.get('raw_forensic', '')}\n\n",
+        )
+        log_sink.write(
+            files["live"], f"{meta_header}\n{packet.get('live_clean', '')}\n\n"
+        )
+
+
+def record_minute(session, entries, packets, journal=None):
+    session.minute_count += len(entries)
+    for formatted_entry in entries:
+        session.rolling.add(formatted_entry)
+
+    # One index row per block; an unsplit merged minute goes with every block
+    for index, packet in enumerate(packets):
+        formatted_entry = entries[index] if len(entries) == len(packets) else entries[0]
+        search_index.add(
+            session.name,
+            session.folder,
+            packet.get("ts", "00:00"),
+            packet.get("seq", 0),
+            packet.get("raw_forensic", ""),
+            formatted_entry.strip().partition("\n")[2],
+        )
+    seqs = [packet.get("seq", 0) for packet in packets]
+
+    # Write Minute (durability follows LOG_DURABILITY)
+    log_sink.write(session.files["minuta"], "".join(entries), commit=True)
+    if journal:
+        journal.append(
+            RECORD_MINUTE, meeting_id=session.meeting_id, seqs=seqs, entries=entries
+        )
+
+
+def write_final_minute(path, head):
+    # Streams the entries already on disk behind the summary into a temp file,
+    # then renames it over the running minute: a crash leaves one or the other
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            out.write(head)
+            out.flush()
+            with open_minute_entries(path) as entries:
+                shutil.copyfileobj(entries, out.buffer, 1024 * 1024)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def finalize_meeting(client, session, name_future, journal=None):
+    # The AI name was requested when the stop began and runs next to the final
+    # summary; the minute file is assembled once both are back
+    gui_queue.put(("status", "🧠 Generando Resumen Final..."))
+    summary = session.rolling.finish()
+
+    gui_queue.put(("status", "🏷️ Generating smart name..."))
+    ai_suggested_name = name_future.result()
+
+    # Everything queued for this meeting is on disk and its files are closed
+    log_sink.barrier(close_folder=session.folder)
+
+    if ai_suggested_name:
+        gui_queue.put(("status", f"📝 Renaming all to: {ai_suggested_name}"))
+
+        new_folder_path = rename_meeting_complete(
+            session.folder, session.name, ai_suggested_name, session.start_time_str
+        )
+
+        # Update paths for final write. The rename swallows its errors (name
+        # collision, file locked by OneDrive), so switch to the new name only
+        # if the minute file really carries it.
+        renamed_files = generate_file_paths(new_folder_path, ai_suggested_name)
+        if os.path.exists(renamed_files["minuta"]):
+            search_index.rename(session.folder, new_folder_path, ai_suggested_name)
+            session.files = renamed_files
+            session.name = ai_suggested_name
+        else:
+            if new_folder_path != session.folder:
+                search_index.rename(session.folder, new_folder_path, session.name)
+            session.files = generate_file_paths(new_folder_path, session.name)
+            gui_queue.put(("status", f"⚠️ Could not rename to: {ai_suggested_name}"))
+        session.folder = new_folder_path
+
+    # Final Write: summary first, then the chronological log copied from disk
+    head = (
+        f"# 📋 MINUTA: {session.name}\n"
+        f"**Start Date:** {session.start_time_str}\n\n"
+        f"{'=' * 60}\n# 🎯 EXECUTIVE SUMMARY\n{'=' * 60}\n\n{summary}\n\n"
+        f"{'=' * 60}\n# 📝 CHRONOLOGICAL LOG\n{'=' * 60}\n"
+    )
+
+    write_final_minute(session.files["minuta"], head)
+    if journal:
+        journal.append(RECORD_FINAL, meeting_id=session.meeting_id)
+
+    gui_queue.put(
+        (
+            "status",
+            f"✅ Saved in: {os.path.basename(os.path.dirname(session.files['minuta']))}",
+        )
+    )
+
+
+def ai_worker(initial_meeting_name=None, journal=None):
     client = get_llm_client()
-    all_minutes_text = []
+    log_sink.start()
 
-    # Capture fixed start time for folder consistency
-    start_time_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # One session per meeting window; the first one is created up front
+    sessions = {}  # meeting_id -> MeetingSession
+    initial_session = MeetingSession(initial_meeting_name)
 
-    current_meeting_name = initial_meeting_name or "Meeting"
+    gui_queue.put(
+        ("status", f"🟢 Ready. Folder: {os.path.basename(initial_session.folder)}")
+    )
 
-    # Initial Setup
-    current_folder = setup_meeting_folder(current_meeting_name, start_time_str)
-    files = generate_file_paths(current_folder, current_meeting_name)
+    # Prompt tokens per block = system prompt + the payload counted by the sensor
+    system_tokens = token_budget.count_tokens(prompts.SMART_SEGMENT_SYSTEM_PROMPT)
 
-    header = f"# LOG - {current_meeting_name} - Start: {start_time_str}\n\n"
+    # Rolling summaries run one at a time next to the segment requests
+    summary_executor = ThreadPoolExecutor(max_workers=1)
 
-    # Init files
-    with open(files["forensic"], "w", encoding="utf-8") as f:
-        f.write(f"# RAW FORENSE {header}")
-    with open(files["live"], "w", encoding="utf-8") as f:
-        f.write(f"# LOG VIVO {header}")
-    with open(files["ai_input"], "w", encoding="utf-8") as f:
-        f.write(f"# AI INPUT {header}")
-    with open(files["minuta"], "w", encoding="utf-8") as f:
-        f.write(f"# TECHNICAL MINUTE {header}")
+    # Meeting-name suggestions start as soon as the stop is requested, while
+    # the last blocks and the final summaries are still running
+    name_executor = ThreadPoolExecutor(max_workers=2)
+    name_futures = {}  # meeting_id -> Future with the suggested name
 
-    gui_queue.put(("status", f"🟢 Ready. Folder: {os.path.basename(current_folder)}"))
+    def request_name(session):
+        if session.meeting_id not in name_futures:
+            name_futures[session.meeting_id] = name_executor.submit(
+                suggest_session_name, client, session
+            )
+        return name_futures[session.meeting_id]
+
+    def session_for(packet):
+        nonlocal initial_session
+        meeting_id = packet.get("meeting_id", DEFAULT_WINDOW_KEY)
+        if meeting_id in sessions:
+            return sessions[meeting_id]
+
+        name = extract_meeting_name_from_window(packet.get("meeting_name"))
+        if initial_session is not None and (
+            not sessions or name == initial_session.name
+        ):
+            session, initial_session = initial_session, None
+        else:
+            taken = {existing.name for existing in sessions.values()}
+            unique_name = name or "Meeting"
+            suffix = 2
+            while unique_name in taken:
+                unique_name = f"{name or 'Meeting'} ({suffix})"
+                suffix += 1
+            session = MeetingSession(unique_name)
+            gui_queue.put(("status", f"🆕 New meeting: {session.name}"))
+
+        session.meeting_id = meeting_id
+        session.rolling = RollingSummary(client, summary_executor)
+        sessions[meeting_id] = session
+        if journal:
+            journal.append(
+                RECORD_MEETING,
+                meeting_id=meeting_id,
+                name=session.name,
+                folder=session.folder,
+                start=session.start_time_str,
+            )
+        return session
+
+    # Up to AI_MAX_IN_FLIGHT blocks run at once; minutes are written in seq order.
+    # Only the oldest pending block streams into the panel, the others buffer.
+    # Blocks whose request fails are parked and sent again when LM Studio is back.
+    in_flight = []  # Submitted and not written yet, in submission order
+    parked = []  # Failed blocks waiting for the server
+    last_parked_retry = 0.0
+    carry = None  # Packet taken from the queue that did not fit the last merge
+    give_up_at = None
+    stream_lock = threading.Lock()
+    executor = ThreadPoolExecutor(max_workers=AI_MAX_IN_FLIGHT)
+
+    def show_partial(job, reset, piece):
+        gui_queue.put(
+            ("ai_partial", {"reset": reset, "header": job.header, "text": piece})
+        )
 
-    while not ai_stop_event.is_set() or not text_process_queue.empty():
-        try:
-            if state.is_shutting_down:
+    def make_on_partial(job):
+        def on_partial(piece, reset=False):
+            with stream_lock:
+                if reset:
+                    job.parts = []
+                else:
+                    job.parts.append(piece)
+                if in_flight and in_flight[0] is job:
+                    show_partial(job, reset, piece)
+
+        return on_partial
+
+    def start(job):
+        job.started = time.perf_counter()
+        system_prompt = prompts.SMART_SEGMENT_SYSTEM_PROMPT
+        if job.coalesced:
+            system_prompt = prompts.COALESCED_SEGMENT_SYSTEM_PROMPT
+        job.future = executor.submit(
+            process_smart_segment, client, job.payload, job.on_partial, system_prompt
+        )
+
+    def take_packets():
+        # Next packet plus, when more are already waiting, the following
+        # blocks of the same meeting that fit in one request. Blocks with a
+        # cached minute go alone, so a rerun is answered from the cache.
+        nonlocal carry
+        if carry is not None:
+            packets, carry = [carry], None
+        else:
+            packets = [text_process_queue.get(timeout=0.1 if in_flight else 0.5)]
+        if llm_cache.contains(segment_cache_key(packets[0])):
+            return packets
+        budget = COALESCE_TOKEN_BUDGET or token_budget.payload_budget(MODEL_NAME)
+        used = packets[0].get("prompt_tokens", 0)
+        while True:
+            try:
+                packet = text_process_queue.get_nowait()
+            except queue.Empty:
+                break
+            cost = token_budget.count_tokens(packet.get("raw_forensic", ""))
+            same_meeting = packet.get("meeting_id") == packets[0].get("meeting_id")
+            consecutive = packet.get("seq") == packets[-1].get("seq", 0) + 1
+            if (
+                not (same_meeting and consecutive)
+                or used + cost > budget
+                or llm_cache.contains(segment_cache_key(packet))
+            ):
+                carry = packet
+                break
+            packets.append(packet)
+            used += cost
+        return packets
+
+    def submit(packets):
+        session = session_for(packets[0])
+        files = session.files
+
+        # Write Logs (packets arrive in block order, so these stay ordered)
+        log_packets(files, packets)
+
+        first_ts = packets[0].get("ts", "00:00")
+        if len(packets) == 1:
+            ts_label = first_ts
+            payload = packets[0].get("ai_payload", "")
+            prompt_tokens = packets[0].get("prompt_tokens", 0)
+            input_header = packets[0].get("meta_header", "")
+        else:
+            ts_label = f"{first_ts}–{packets[-1].get('ts', '00:00')}"
+            build = build_coalesced_payload(packets)
+            payload, prompt_tokens = build.text, build.tokens
+            input_header = (
+                f"--- BLOQUES {ts_label} (Fusionados: {len(packets)} | "
+                f"Tokens: {prompt_tokens}) ---"
+            )
+
+        meeting_tag = f"[{session.name}] " if len(sessions) > 1 else ""
+        job = SegmentJob(
+            session, packets, f"{meeting_tag}⏱️ {ts_label}\n", payload, prompt_tokens
+        )
+        job.input_header = input_header
+        if session.next_seq is None:
+            session.next_seq = job.seq
+
+        if STREAM_SEGMENT_MINUTES:
+            job.on_partial = make_on_partial(job)
+        with stream_lock:
+            in_flight.append(job)
+        start(job)
+
+    def write_minute(job):
+        session = job.session
+        minute_txt, ttft = job.result
+
+        # The input is logged once its answer is back, so its header can keep
+        # the block's TTFT (cached and failed minutes have none)
+        input_header = job.input_header
+        if ttft is not None and input_header.endswith(") ---"):
+            cut = input_header.rindex(")")
+            input_header = (
+                f"{input_header[:cut]} | TTFT {ttft:.1f}s{input_header[cut:]}"
+            )
+            gui_queue.put(
+                (
+                    "status",
+                    f"✅ Block {job.header.strip()}: TTFT {ttft:.1f}s | "
+                    f"total {time.perf_counter() - job.started:.1f}s | "
+                    f"prompt ~{system_tokens + job.prompt_tokens} tok",
+                )
+            )
+        log_sink.write(session.files["ai_input"], f"{input_header}\n{job.payload}\n\n")
+
+        # A merged answer is split back into one section per block timestamp;
+        # if the model ignored the markers it stays whole under all of them
+        timestamps = [packet.get("ts", "00:00") for packet in job.packets]
+        minutes = [minute_txt]
+        if job.coalesced:
+            minutes = split_coalesced_minute(minute_txt, len(job.packets))
+            for packet, text in zip(job.packets, minutes or []):
+                llm_cache.put(
+                    segment_cache_key(packet), text, model=MODEL_NAME, kind="segment"
+                )
+        if minutes is not None:
+            entries = [
+                f"\n## ⏱️ {ts}\n{text}\n" for ts, text in zip(timestamps, minutes)
+            ]
+        else:
+            entries = [f"\n## ⏱️ {' + '.join(timestamps)}\n{minute_txt}\n"]
+
+        record_minute(session, entries, job.packets, journal)
+
+        # UI Update
+        clean_ui = (
+            minute_txt.replace("### ", "")
+            .replace("**", "")
+            .replace("labels:", "")
+            .strip()
+        )
+        gui_queue.put(("ai_new", f"{job.header}{clean_ui}\n{'-' * 40}\n"))
+
+    def release(job):
+        with stream_lock:
+            in_flight.remove(job)
+            # Hand the panel to the next oldest block with what it has so far
+            if STREAM_SEGMENT_MINUTES and in_flight:
+                show_partial(in_flight[0], True, "".join(in_flight[0].parts))
+        for _ in job.packets:
+            text_process_queue.task_done()
+
+    def collect_finished():
+        for job in in_flight:
+            if job.future is None or not job.future.done():
+                continue
+            try:
+                job.result = job.future.result()
+            except Exception as e:
+                if not is_retryable(e):
+                    # The request itself is rejected: write its error and move on
+                    job.result = (f"Error IA (Final): {e}", None)
+                    job.session.ready[job.seq] = job
+                    job.future = None
+                    continue
+                job.error = str(e)
+                parked.append(job)
                 gui_queue.put(
                     (
                         "status",
-                        f"🛑 Shutdown: Processing {text_process_queue.qsize()} blocks...",
+                        f"⏸️ IA no disponible: {len(parked)} bloque(s) en espera",
                     )
                 )
+            else:
+                segmentation.report_latency(time.perf_counter() - job.started)
+                job.session.ready[job.seq] = job
+            job.future = None
+
+    def commit_ready():
+        for session in sessions.values():
+            while session.next_seq in session.ready:
+                job = session.ready.pop(session.next_seq)
+                session.next_seq += len(job.packets)
+                try:
+                    write_minute(job)
+                finally:
+                    release(job)
+
+    def retry_parked(running):
+        # Closed breaker: resend in order. Open: one block at a time acts as the
+        # trial call (it fails fast until the breaker's health probe passes).
+        nonlocal last_parked_retry
+        if not parked:
+            return
+        if not llm_breaker.is_closed and (
+            running or time.monotonic() - last_parked_retry < BREAKER_RESET_SECONDS
+        ):
+            return
+        last_parked_retry = time.monotonic()
+        room = AI_MAX_IN_FLIGHT - running if llm_breaker.is_closed else 1
+        for job in parked[:room]:
+            parked.remove(job)
+            start(job)
+
+    def give_up_parked():
+        # Shutdown with the server still down: keep the error, like before
+        for job in parked:
+            job.result = (f"Error IA (Final): {job.error}", None)
+            job.session.ready[job.seq] = job
+        parked.clear()
+
+    while (
+        not ai_stop_event.is_set()
+        or not text_process_queue.empty()
+        or in_flight
+        or carry is not None
+    ):
+        try:
+            collect_finished()
+            commit_ready()
 
-            packet = text_process_queue.get(timeout=0.5)
+            running = [job.future for job in in_flight if job.future is not None]
+            retry_parked(len(running))
 
-            # Unpack dict from Sensor v5
-            ts = packet.get("ts", "00:00")
-            raw_forensic = packet.get("raw_forensic", "")
-            live_clean = packet.get("live_clean", "")
-            ai_payload = packet.get("ai_payload", "")
-            meta_header = packet.get("meta_header", "")
+            if state.is_shutting_down:
+                pending = text_process_queue.qsize() + len(in_flight)
+                gui_queue.put(
+                    ("status", f"🛑 Shutdown: Processing {pending} blocks...")
+                )
 
-            if not state.is_shutting_down:
-                gui_queue.put(("status", f"⚡ Processing block {ts}..."))
-
-            # Write Logs
-            with open(files["forensic"], "a", encoding="utf-8") as f:
-                f.write(f"{meta_header}\n{raw_forensic}\n\n")
-
-            with open(files["live"], "a", encoding="utf-8") as f:
-                f.write(f"{meta_header}\n{live_clean}\n\n")
-
-            with open(files["ai_input"], "a", encoding="utf-8") as f:
-                f.write(f"{meta_header}\n{ai_payload}\n\n")
-
-            # AI Processing
-            minute_txt = process_smart_segment(client, ai_payload)
-            formatted_entry = f"\n## ⏱️ {ts}\n{minute_txt}\n"
-            all_minutes_text.append(formatted_entry)
-
-            # Write Minute
-            with open(files["minuta"], "a", encoding="utf-8") as f:
-                f.write(formatted_entry)
-                f.flush()
-                os.fsync(f.fileno())
-
-            # UI Update
-            clean_ui = (
-                minute_txt.replace("### ", "")
-                .replace("**", "")
-                .replace("labels:", "")
-                .strip()
-            )
-            gui_queue.put(("ai_new", f"⏱️ {ts}\n{clean_ui}\n{'-' * 40}\n"))
+            if ai_stop_event.is_set() and not name_futures:
+                for session in sessions.values():
+                    if session.minute_count:
+                        request_name(session)
 
-            text_process_queue.task_done()
+            if ai_stop_event.is_set() and parked and not running:
+                if give_up_at is None:
+                    give_up_at = time.monotonic() + SHUTDOWN_RETRY_GRACE
+                elif time.monotonic() > give_up_at and text_process_queue.empty():
+                    give_up_parked()
+                    continue
+
+            if len(running) >= AI_MAX_IN_FLIGHT:
+                wait(running, 0.5, FIRST_COMPLETED)
+                continue
+
+            packets = take_packets()
+
+            if not state.is_shutting_down:
+                label = packets[0].get("ts", "00:00")
+                if len(packets) > 1:
+                    label += f" (+{len(packets) - 1} merged)"
+                gui_queue.put(("status", f"⚡ Processing block {label}..."))
+            submit(packets)
         except queue.Empty:
             continue
         except Exception as e:
             gui_queue.put(("status", f"AI Thread Error: {e}"))
 
+    executor.shutdown(wait=True)
+
     # Post-Processing
-    if all_minutes_text:
-        full_text = "".join(all_minutes_text)
-        summary = generate_final_summary(client, full_text)
+    # A meeting that fails to finalize keeps its journal for the next start,
+    # but never keeps the window from closing
+    finished = [session for session in sessions.values() if session.minute_count]
+    all_finalized = True
+    with ThreadPoolExecutor(max_workers=max(1, len(finished))) as finalizer:
+        futures = {
+            finalizer.submit(
+                finalize_meeting, client, session, request_name(session), journal
+            ): session
+            for session in finished
+        }
+        for future, session in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                all_finalized = False
+                gui_queue.put(
+                    ("status", f"❌ Final minute failed ({session.name}): {e}")
+                )
+    if not finished:
+        gui_queue.put(("status", "⚠️ Finished without data."))
+    summary_executor.shutdown(wait=False)
+    name_executor.shutdown(wait=False)
+    if journal and all_finalized:
+        journal.discard()
+    log_sink.close()
+    search_index.close()
 
-        gui_queue.put(("status", "🏷️ Generating smart name..."))
-        ai_suggested_name = suggest_meeting_name_with_ai(client, full_text)
+    gui_queue.put(("shutdown_complete", True))
 
-        if ai_suggested_name:
-            gui_queue.put(("status", f"📝 Renaming all to: {ai_suggested_name}"))
 
-            new_folder_path = rename_meeting_complete(
-                current_folder, current_meeting_name, ai_suggested_name, start_time_str
-            )
+_TTFT_IN_HEADER = re.compile(r" \| TTFT [\d.]+s(?=\) ---$)")
+
 
-            # Update paths for final write
-            files = generate_file_paths(new_folder_path, ai_suggested_name)
-            current_meeting_name = ai_suggested_name
+def logged_headers(path):
+    # Entry headers already in a meeting log, without the TTFT of AI inputs
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {
+                _TTFT_IN_HEADER.sub("", line.rstrip("\n"))
+                for line in f
+                if line.startswith("--- ")
+            }
+    except OSError:
+        return set()
+
+
+def resume_meeting(client, meeting, journal, summary_executor, name_executor):
+    # Minutes for the blocks the dead run never finished, then a fresh summary
+    name = meeting.name
+    if meeting.folder is None:
+        name = extract_meeting_name_from_window(name)
+    session = MeetingSession(
+        name, meeting.meeting_id, meeting.folder, meeting.start_time_str
+    )
+    session.rolling = RollingSummary(client, summary_executor)
 
-        # Final Write
-        final_content = (
-            f"# 📋 MINUTA: {current_meeting_name}\n"
-            f"**Start Date:** {start_time_str}\n\n"
-            f"{'=' * 60}\n# 🎯 EXECUTIVE SUMMARY\n{'=' * 60}\n\n{summary}\n\n"
-            f"{'=' * 60}\n# 📝 CHRONOLOGICAL LOG\n{'=' * 60}\n{full_text}"
+    # The running minute is rebuilt from the journal (the file may have lost
+    # its last group commit); the summary is refolded entry by entry, waiting
+    # for each background fold so only one chunk is ever held in memory
+    log_sink.write(
+        session.files["minuta"], f"# TECHNICAL MINUTE {session.header}", truncate=True
+    )
+    for entries in journal.minute_entries(meeting.meeting_id):
+        log_sink.write(session.files["minuta"], "".join(entries))
+        session.minute_count += len(entries)
+        for formatted_entry in entries:
+            session.rolling.add(formatted_entry)
+            session.rolling.idle.wait()
+    if session.folder != meeting.folder:
+        journal.append(
+            RECORD_MEETING,
+            meeting_id=session.meeting_id,
+            name=session.name,
+            folder=session.folder,
+            start=session.start_time_str,
         )
 
-        with open(files["minuta"], "w", encoding="utf-8") as f:
-            f.write(final_content)
+    pending = meeting.pending_packets
+    gui_queue.put(
+        ("status", f"♻️ Reanudando {session.name}: {len(pending)} bloque(s) sin minuta")
+    )
 
-        gui_queue.put(
-            (
-                "status",
-                f"✅ Saved in: {os.path.basename(os.path.dirname(files['minuta']))}",
-            )
-        )
+    # Blocks still in the queue when the run died never reached the logs;
+    # inputs are logged with their answer, so one is only there if the dead
+    # run lost the minute right after it
+    logged = {
+        view: logged_headers(session.files[view]) for view in ("forensic", "ai_input")
+    }
+    for packet in pending:
+        meta_header = packet.get("meta_header", "")
+        if meta_header not in logged["forensic"]:
+            log_packets(session.files, [packet])
+        payload = packet.get("ai_payload", "")
+        if meta_header not in logged["ai_input"]:
+            log_sink.write(session.files["ai_input"], f"{meta_header}\n{payload}\n\n")
+        minute_txt, _ = process_smart_segment(client, payload)
+        entries = [f"\n## ⏱️ {packet.get('ts', '00:00')}\n{minute_txt}\n"]
+        record_minute(session, entries, [packet], journal)
+
+    if session.minute_count:
+        name_future = name_executor.submit(suggest_session_name, client, session)
+        finalize_meeting(client, session, name_future, journal)
     else:
-        gui_queue.put(("status", "⚠️ Finished without data."))
+        journal.append(RECORD_FINAL, meeting_id=session.meeting_id)
 
-    gui_queue.put(("shutdown_complete", True))
+
+def resume_worker(journals):
+    # Runs next to the live pipeline; a journal is only deleted once every
+    # meeting in it is finalized, so a failure here is retried on the next start
+    client = get_llm_client()
+    summary_executor = ThreadPoolExecutor(max_workers=1)
+    name_executor = ThreadPoolExecutor(max_workers=1)
+    for path, meetings in journals:
+        journal = MeetingJournal(JOURNAL_DIR, log_sink, path=path)
+        try:
+            for meeting in meetings:
+                resume_meeting(
+                    client, meeting, journal, summary_executor, name_executor
+                )
+        except Exception as e:
+            gui_queue.put(("status", f"⏸️ Reanudación pendiente: {e}"))
+            continue
+        journal.discard()
+    summary_executor.shutdown(wait=False)
+    name_executor.shutdown(wait=False)
+
+
+def is_final_minute(path):
+    # finalize_meeting() writes the summary header over the running minute
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.readline().startswith("# 📋 MINUTA: ")
+    except OSError:
+        return False
+
+
+def archive_worker(skip_folders):
+    # Packs the logs of meetings finalized by earlier runs; folders still
+    # waiting in a journal are left for resume_worker
+    if not os.path.isdir(OUTPUT_DIR):
+        return
+    for name in sorted(os.listdir(OUTPUT_DIR)):
+        folder = os.path.join(OUTPUT_DIR, name)
+        if not os.path.isdir(folder) or folder in skip_folders:
+            continue
+        for files in meeting_log_files(folder):
+            minute = files["forensic"].replace("_RAW_FORENSE.txt", "_MINUTA.md")
+            if not is_final_minute(minute):
+                continue
+            try:
+                archive_meeting(files)
+            except (ArchiveError, OSError) as e:
+                gui_queue.put(("status", f"⚠️ Logs kept as text: {e}"))
 
 
-def capture_worker(translator):
+def capture_worker(translator, journal=None):
     def on_smart_block(payload):
+        if journal:
+            journal.append(
+                RECORD_PACKET, meeting_id=payload.get("meeting_id"), packet=payload
+            )
         text_process_queue.put(payload)
 
-    def on_live_feed(text_buffer):
-        gui_queue.put(("live", text_buffer))
+    # Recent committed lines so the translator still sees the last ~600 chars
+    recent_lines = deque(maxlen=tsc.LIVE_VIEW_LINES)
+
+    def on_live_feed(delta):
+        gui_queue.put(("live_delta", delta))
+        if delta.get("reset"):
+            recent_lines.clear()  # Another window: no context from the last meeting
+        recent_lines.extend(delta["committed"])
+        text_buffer = "\n".join([*recent_lines, delta["active"]])
         if len(text_buffer) > 2:
             translator.translate_live_view(
                 text_buffer[-600:], lambda trans: gui_queue.put(("trans", trans))
             )
 
+    source = tsc.TeamsUIACaptionSource()
+    if RECORD_CAPTION_FRAMES:
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        frames_path = os.path.join(OUTPUT_DIR, "frames", f"frames_{stamp}.jsonl.gz")
+        source = RecordingCaptionSource(source, frames_path)
+
+    def on_scheduler_stats(scheduler):
+        gui_queue.put(
+            (
+                "sensor_stats",
+                f"SENSOR {scheduler.poll_rate_hz:.1f} Hz | "
+                f"{scheduler.tick_seconds * 1000:.1f} ms/tick | "
+                f"CPU {scheduler.cpu_load:.1%}",
+            )
+        )
+
+    scheduler = tsc.CaptureScheduler(on_stats=on_scheduler_stats)
+
     state.source_name = "Teams Capture"
-    tsc.start_headless_capture(on_smart_block, on_live_feed, capture_stop_event)
+    tsc.start_headless_capture(
+        on_smart_block,
+        on_live_feed,
+        capture_stop_event,
+        source=source,
+        live_delta=True,
+        scheduler=scheduler,
+        payload_budget=token_budget.payload_budget(MODEL_NAME),
+        segmentation=segmentation,
+    )
 
 
 def perform_shutdown_sequence():
@@ -354,10 +1317,21 @@ def main():
     except Exception:
         pass
 
+    # Meetings left unfinished by a run that died are resumed in the background
+    journals = unfinished_journals(JOURNAL_DIR)
+    journal = MeetingJournal(JOURNAL_DIR, log_sink)
+    if journals:
+        threading.Thread(target=resume_worker, args=(journals,), daemon=True).start()
+    if ARCHIVE_TRANSCRIPTS:
+        resuming = {meeting.folder for _, meetings in journals for meeting in meetings}
+        threading.Thread(target=archive_worker, args=(resuming,), daemon=True).start()
+
+    threading.Thread(
+        target=ai_worker, args=(initial_meeting_name, journal), daemon=True
+    ).start()
     threading.Thread(
-        target=ai_worker, args=(initial_meeting_name,), daemon=True
+        target=capture_worker, args=(translator, journal), daemon=True
     ).start()
-    threading.Thread(target=capture_worker, args=(translator,), daemon=True).start()
 
     app = MeetCopilotApp(
         s_lang, t_lang, gui_queue, state, translator, perform_shutdown_sequence
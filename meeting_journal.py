@@ -0,0 +1,127 @@
+import glob
+import json
+import os
+import zlib
+from datetime import datetime
+
+# Record types, in the order they appear for one meeting
+RECORD_PACKET = "packet"  # Block committed by the capture (before any AI work)
+RECORD_MEETING = "meeting"  # Output folder assigned to a meeting_id
+RECORD_MINUTE = "minute"  # Minute entries written for one or more block seqs
+RECORD_FINAL = "final"  # Final document written; nothing left to resume
+
+
+def encode_record(record):
+    # "<crc32> <json>\n": a torn last line fails the checksum and is skipped
+    body = json.dumps(record, ensure_ascii=False, default=str)
+    return f"{zlib.crc32(body.encode('utf-8')):08x} {body}\n"
+
+
+def iter_records(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            crc, _, body = line.rstrip("\n").partition(" ")
+            try:
+                if int(crc, 16) != zlib.crc32(body.encode("utf-8")):
+                    continue
+                record = json.loads(body)
+            except ValueError:
+                continue
+            yield record
+
+
+class MeetingJournal:
+    """
+    Append-only log of one run: every captured block, the folder of every
+    meeting and every written minute, each line with a CRC32.
+
+    Records go through the LogSink, so they share its durability setting.
+    The file is deleted once all meetings of the run are finalized; any
+    journal left in the folder at startup belongs to a run that died.
+    """
+
+    def __init__(self, folder, sink, path=None):
+        self.sink = sink
+        if path is None:
+            stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+            path = os.path.join(folder, f"journal_{stamp}.jsonl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+
+    def append(self, record_type, **fields):
+        record = dict(fields, type=record_type)
+        self.sink.write(self.path, encode_record(record), commit=True)
+
+    def minute_entries(self, meeting_id):
+        # Entries of every minute record of a meeting, read back one at a time
+        self.sink.barrier()
+        for record in iter_records(self.path):
+            if (
+                record.get("type") == RECORD_MINUTE
+                and record.get("meeting_id") == meeting_id
+            ):
+                yield record["entries"]
+
+    def discard(self):
+        # Clean end of the run: wait for pending records, then drop the file
+        self.sink.barrier(close_folder=os.path.dirname(self.path))
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class JournalMeeting:
+    """State of one meeting rebuilt from a journal."""
+
+    def __init__(self, meeting_id):
+        self.meeting_id = meeting_id
+        self.name = None
+        self.folder = None
+        self.start_time_str = None
+        self.packets = {}  # seq -> packet still without a minute
+        self.minute_count = 0  # Entries are read back from the journal on resume
+        self.done_seqs = set()
+        self.finished = False
+
+    @property
+    def pending_packets(self):
+        return [self.packets[seq] for seq in sorted(self.packets)]
+
+
+def replay(records):
+    meetings = {}  # meeting_id -> JournalMeeting
+    for record in records:
+        meeting_id = record.get("meeting_id")
+        meeting = meetings.setdefault(meeting_id, JournalMeeting(meeting_id))
+        record_type = record.get("type")
+        if record_type == RECORD_PACKET:
+            packet = record["packet"]
+            if packet.get("seq", 0) not in meeting.done_seqs:
+                meeting.packets[packet.get("seq", 0)] = packet
+            meeting.name = meeting.name or packet.get("meeting_name")
+        elif record_type == RECORD_MEETING:
+            meeting.name = record["name"]
+            meeting.folder = record["folder"]
+            meeting.start_time_str = record["start"]
+        elif record_type == RECORD_MINUTE:
+            # Packets with a minute are dropped so replay holds only the backlog
+            meeting.minute_count += len(record["entries"])
+            meeting.done_seqs.update(record["seqs"])
+            for seq in record["seqs"]:
+                meeting.packets.pop(seq, None)
+        elif record_type == RECORD_FINAL:
+            meeting.finished = True
+    return [meeting for meeting in meetings.values() if not meeting.finished]
+
+
+def unfinished_journals(folder):
+    # (path, meetings to resume) for every journal a previous run left behind
+    found = []
+    for path in sorted(glob.glob(os.path.join(folder, "journal_*.jsonl"))):
+        try:
+            meetings = replay(iter_records(path))
+        except OSError:
+            continue
+        found.append((path, meetings))
+    return found
@@ -39,6 +39,20 @@ Tu prioridad #1 es limpiar el texto usando las SUGERENCIAS DEL SENSOR y tu senti
 * [Tarea]: ...
 """
 
+COALESCED_SEGMENT_SYSTEM_PROMPT = (
+    SMART_SEGMENT_SYSTEM_PROMPT
+    + """
+# MODO MULTI-SEGMENTO:
+El input trae VARIOS segmentos consecutivos, cada uno con su encabezado
+"--- SEGMENTO N (HH:MM, X palabras) ---". Las SUGERENCIAS DEL SENSOR aplican a todos.
+
+Analiza cada segmento por separado y en orden. Antes del análisis de cada uno
+escribe EXACTAMENTE una línea de separación con su número:
+=== SEGMENTO N ===
+y debajo el FORMATO DE SALIDA completo para ese segmento. No omitas ningún segmento.
+"""
+)
+
 FINAL_SUMMARY_SYSTEM_PROMPT = """
 # ROL: CTO & Lead Technical PMO
 # TAREA: Generar un REPORTE TÉCNICO-EJECUTIVO MAESTRO.
@@ -75,6 +89,21 @@ Recibes una serie de minutas cronológicas ya procesadas y limpias. Tu trabajo N
 (Basado en la discusión, identifica contradicciones implícitas o riesgos que el equipo pasó por alto. Ej: "Hablan de migrar a v3 pero no mencionaron pruebas de regresión").
 """
 
+ROLLING_SUMMARY_SYSTEM_PROMPT = (
+    FINAL_SUMMARY_SYSTEM_PROMPT
+    + """
+# MODO INCREMENTAL:
+Recibirás dos partes:
+1. REPORTE ACUMULADO: El reporte generado con las minutas anteriores (puede estar vacío).
+2. NUEVAS MINUTAS: Las minutas cronológicas que aún no están en el reporte.
+
+Devuelve el REPORTE COMPLETO actualizado con el mismo formato de salida.
+- Integra lo nuevo en las secciones existentes; no agregues una sección por bloque.
+- Si una decisión nueva reemplaza a una anterior, conserva solo la vigente.
+- Mantén el reporte compacto: prioriza decisiones, riesgos y action items.
+"""
+)
+
 MEETING_NAME_SYSTEM_PROMPT = """
 Eres un experto en nomenclatura técnica. Tu meta es generar un nombre de archivo que identifique el propósito técnico de la reunión.
 Usa CamelCase o guiones bajos si es necesario, pero sé directo.
@@ -0,0 +1,281 @@
+import os
+import queue
+import re
+import sqlite3
+import threading
+
+from transcript_archive import (
+    ArchiveError,
+    TranscriptArchive,
+    read_log,
+    read_text,
+)
+
+# One row per block; bm25 weights follow the column order below
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS blocks USING fts5(
+    meeting, ts, speakers, transcript, minute,
+    folder UNINDEXED, started UNINDEXED, seq UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+RANK_WEIGHTS = (2.0, 0.5, 1.0, 1.0, 3.0)  # Decisions live in the minute text
+
+_SPEAKER = re.compile(r"^\[([^\]]+)\]:", re.MULTILINE)
+_FOLDER_STAMP = re.compile(r"_(\d{4}-\d{2}-\d{2})_(\d{2})-(\d{2})-(\d{2})$")
+_MINUTE_HEADING = re.compile(r"^## ⏱️ (.+)$", re.MULTILINE)
+_MEETING_TITLE = re.compile(
+    r"^# (?:📋 MINUTA: (.+)|TECHNICAL MINUTE # LOG - (.+) - Start: )", re.MULTILINE
+)
+_BLOCK_TS = re.compile(r"^--- BLOQUE (\S+) ")
+_WORD = re.compile(r"\w+")
+
+
+def connect(path):
+    # Raises sqlite3.OperationalError when the sqlite build lacks FTS5
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")  # Queries run while the app writes
+    conn.execute(SCHEMA)
+    return conn
+
+
+def started_from_folder(folder):
+    match = _FOLDER_STAMP.search(os.path.basename(folder))
+    if not match:
+        return ""
+    day, hour, minute, second = match.groups()
+    return f"{day} {hour}:{minute}:{second}"
+
+
+def block_row(meeting, folder, ts, seq, transcript, minute):
+    speakers = " ".join(dict.fromkeys(_SPEAKER.findall(transcript)))
+    return (
+        meeting,
+        ts,
+        speakers,
+        transcript,
+        minute,
+        os.path.basename(folder),
+        started_from_folder(folder),
+        seq,
+    )
+
+
+def insert_rows(conn, rows):
+    conn.executemany(
+        "INSERT INTO blocks (meeting, ts, speakers, transcript, minute, "
+        "folder, started, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def rename_folder(conn, old_folder, new_folder, meeting):
+    conn.execute(
+        "UPDATE blocks SET folder = ?, started = ?, meeting = ? WHERE folder = ?",
+        (
+            os.path.basename(new_folder),
+            started_from_folder(new_folder),
+            meeting,
+            os.path.basename(old_folder),
+        ),
+    )
+
+
+# Question words dropped from free-text queries: they match nearly every block
+# and would make each query rank the whole table
+STOPWORDS = set(
+    """
+    a al como con cual cuando cuándo de del donde dónde el en es esta este fue
+    la las lo los me mi no o para pero por que qué quien quién se sobre su un
+    una y ya the a an and did do does for how in is of on or to we what when
+    where which who why with
+    """.split()
+)
+
+
+def match_query(text):
+    # Free text -> FTS5 OR query of quoted terms, so punctuation never breaks
+    # the syntax and bm25 favours blocks that hold more of the rarer words
+    terms = list(dict.fromkeys(word.lower() for word in _WORD.findall(text)))
+    terms = [term for term in terms if term not in STOPWORDS] or terms
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search(conn, text, limit=20, raw=False):
+    """
+    Ranked blocks for a query: (meeting, started, ts, folder, snippet, rank).
+    raw=True passes FTS5 syntax through (phrases, NEAR, column filters).
+    """
+    query = text if raw else match_query(text)
+    if not query:
+        return []
+    weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+    return conn.execute(
+        f"SELECT meeting, started, ts, folder, "
+        f"snippet(blocks, -1, '[', ']', '…', 16), bm25(blocks, {weights}) AS rank "
+        f"FROM blocks WHERE blocks MATCH ? ORDER BY rank LIMIT ?",
+        (query, limit),
+    ).fetchall()
+
+
+def _minute_sections(text):
+    # [(timestamps, text)] from the "## ⏱️ ts" sections of a minute file
+    headings = list(_MINUTE_HEADING.finditer(text))
+    sections = []
+    for heading, following in zip(headings, headings[1:] + [None]):
+        end = following.start() if following else len(text)
+        body = text[heading.end() : end].strip()
+        sections.append((heading.group(1).split(" + "), body))
+    return sections
+
+
+def _transcript_blocks(folder):
+    # [(ts, raw)] from the forensic log, or from the archive once packed
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.endswith("_RAW_FORENSE.txt"):
+            with open(path, "r", encoding="utf-8") as f:
+                _, entries = read_log(f)
+                return [
+                    (
+                        _BLOCK_TS.match(meta).group(1) if _BLOCK_TS.match(meta) else "",
+                        raw,
+                    )
+                    for meta, raw in entries
+                ]
+        if name.endswith("_TRANSCRIPT.mcarch"):
+            return [
+                (record["ts"], record["raw"])
+                for record in TranscriptArchive(path).records()
+                if record["kind"] == "block"
+            ]
+    return []
+
+
+def folder_rows(folder):
+    # Blocks of one meeting folder paired with their minute sections in order
+    minute_path = next(
+        (
+            os.path.join(folder, name)
+            for name in sorted(os.listdir(folder))
+            if name.endswith("_MINUTA.md")
+        ),
+        None,
+    )
+    if minute_path is None:
+        return []
+    text = read_text(minute_path)
+    title = _MEETING_TITLE.search(text)
+    if title:
+        meeting = title.group(1) or title.group(2)
+    else:
+        meeting = os.path.basename(minute_path)[: -len("_MINUTA.md")]
+    minutes = {}
+    for timestamps, body in _minute_sections(text):
+        for ts in timestamps:
+            minutes.setdefault(ts, []).append(body)
+
+    rows = []
+    for seq, (ts, raw) in enumerate(_transcript_blocks(folder)):
+        pending = minutes.get(ts) or [""]
+        minute = pending.pop(0) if len(pending) > 1 else pending[0]
+        rows.append(block_row(meeting, folder, ts, seq, raw, minute))
+    return rows
+
+
+def rebuild(conn, root):
+    """Reindexes every meeting folder under root; returns (meetings, blocks)."""
+    meetings = blocks = 0
+    conn.execute("DELETE FROM blocks")
+    for name in sorted(os.listdir(root)):
+        folder = os.path.join(root, name)
+        if not os.path.isdir(folder) or name.startswith(".") or name == "frames":
+            continue
+        try:
+            rows = folder_rows(folder)
+        except (ArchiveError, OSError):
+            continue
+        if rows:
+            insert_rows(conn, rows)
+            meetings += 1
+            blocks += len(rows)
+    conn.commit()
+    return meetings, blocks
+
+
+class SearchIndexWriter:
+    """
+    Background writer that keeps the index current while ai_worker runs.
+
+    Rows are queued by the AI thread and committed in batches by a single
+    connection; if sqlite lacks FTS5 the writer reports it once and then
+    ignores further rows.
+    """
+
+    def __init__(self, path, enabled=True, on_error=None):
+        self.path = path
+        self.enabled = enabled
+        self.on_error = on_error
+        self.records = queue.Queue()
+        self.thread = None
+        self.start_lock = threading.Lock()
+
+    def _put(self, record):
+        if not self.enabled:
+            return
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.records.put(record)
+
+    def add(self, meeting, folder, ts, seq, transcript, minute):
+        self._put(("add", block_row(meeting, folder, ts, seq, transcript, minute)))
+
+    def rename(self, old_folder, new_folder, meeting):
+        self._put(("rename", (old_folder, new_folder, meeting)))
+
+    def close(self, timeout=None):
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                return
+            self.records.put(None)
+            self.thread.join(timeout)
+
+    def _run(self):
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error as e:
+            self.enabled = False
+            if self.on_error:
+                self.on_error(e)
+            return
+        try:
+            while True:
+                batch = [self.records.get()]
+                while True:
+                    try:
+                        batch.append(self.records.get_nowait())
+                    except queue.Empty:
+                        break
+                rows = []
+                for record in batch:
+                    if record is None:
+                        break
+                    kind, data = record
+                    if kind == "add":
+                        rows.append(data)
+                        continue
+                    insert_rows(conn, rows)
+                    rows = []
+                    rename_folder(conn, *data)
+                insert_rows(conn, rows)
+                conn.commit()
+                if None in batch:
+                    return
+        except sqlite3.Error as e:
+            if self.on_error:
+                self.on_error(e)
+        finally:
+            conn.close()
@@ -6,9 +6,22 @@ import string
 import threading
 import time
 from collections import deque
+from contextlib import nullcontext
 from difflib import SequenceMatcher
 
-import uiautomation as auto
+try:
+    import uiautomation as auto
+except ImportError:  # Replay sources let the sensor run without Windows UIA
+    auto = None
+
+from caption_sources import (
+    DEFAULT_WINDOW_KEY,
+    CaptionChangeNotifier,
+    CaptionSource,
+    WindowFeed,
+)
+from glossary_engine import FuzzyTermIndex, GlossaryEngine
+from token_budget import DEFAULT_PAYLOAD_TOKEN_BUDGET, PayloadSection, build_payload
 
 # === CONFIGURATION ===
 WORD_THRESHOLD = 350
@@ -16,29 +29,640 @@ SILENCE_TIMEOUT = 20
 MIN_WORDS_FOR_TIMEOUT = 50
 CONTEXT_OVERLAP = 150
 FUZZY_THRESHOLD = 0.80
+LIVE_VIEW_LINES = 8  # Committed lines kept on the live panel
+CAPTION_SEARCH_DEPTH = 14
+WINDOW_REFRESH_SECONDS = 10
+EMPTY_WINDOW_RECHECK = 2.0  # Seconds before re-walking a window that had no captions
+# Windows that never showed captions (main client, calendar) back off up to this
+EMPTY_WINDOW_RECHECK_MAX = 30.0
+
+# "events" waits for UIA change notifications (polling stays as fallback), "poll" never subscribes
+CAPTURE_MODE = "events"
+POLL_INTERVAL = 0.1
+EVENT_FALLBACK_INTERVAL = 1.0
+
+# Adaptive scheduler (live sources): fast while captions change, backs off otherwise
+POLL_INTERVAL_ACTIVE = 0.05
+POLL_INTERVAL_IDLE_MAX = 1.0  # Teams open, captions unchanged
+POLL_INTERVAL_ABSENT_MAX = 2.0  # No Teams window / no captions on screen
+CPU_BUDGET = 0.05  # Max capture-thread CPU seconds per wall second
+SCHEDULER_STATS_WINDOW = 2.0
+
+# Adaptive segmentation: block size follows AI backpressure within hard limits
+BLOCK_WORDS_MIN = 200
+BLOCK_WORDS_MAX = 900
+BLOCK_GROWTH = 1.25  # Step per committed block, up when behind, down when idle
+MAX_MINUTE_DELAY = 120  # Seconds of AI delay (queue + latency) before growing blocks
+LATENCY_SMOOTHING = 0.3
+
+CORRECTION_SIMILARITY = 0.65  # Loose threshold for Teams rewriting the active line
+AUTOJUNK_MIN_LENGTH = 200  # SequenceMatcher drops popular characters from longer lines
 
 EXCLUDED_SPEAKERS = ["Usuario desconocido", "Unknown User"]
 
+# Active line change classification (Cases A, B and C in TeamsRecorderSmart.update)
+LINE_GROWTH = "growth"
+LINE_CORRECTION = "correction"
+LINE_NEW = "new"
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
+
+def _common_prefix_len(a, b):
+    # Binary search over slice equality keeps the comparison in C
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_len(a, b):
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _first_block(a, b, size):
+    """
+    Where SequenceMatcher (nothing junk) puts its first block when the longest
+    common substring is `size` chars: earliest in `a`, then earliest in `b`.
+    None if some common substring is longer.
+    """
+    longer = {b[j : j + size + 1] for j in range(len(b) - size)}
+    if any(a[i : i + size + 1] in longer for i in range(len(a) - size)):
+        return None
+    grams = {b[j : j + size] for j in range(len(b) - size + 1)}
+    for i in range(len(a) - size + 1):
+        if a[i : i + size] in grams:
+            return i, b.find(a[i : i + size])
+    return None
+
+
+def _matched_chars(a, b):
+    if not a or not b:
+        return 0
+    blocks = SequenceMatcher(None, a, b, autojunk=False).get_matching_blocks()
+    return sum(block.size for block in blocks)
+
+
+def classify_line_change(norm_active, norm_new):
+    """
+    Compares normalized caption text with the normalized active line.
+
+    Gives the same answer as SequenceMatcher(None, active, new).ratio(). Below
+    the autojunk size, when the shared prefix (or suffix) is the longest
+    common block, it is the matcher's first block and only the changed text
+    around it is matched; bounds on those pieces settle most frames first.
+    """
+    if norm_new.startswith(norm_active) or norm_active in norm_new:
+        return LINE_GROWTH
+    if not norm_active or not norm_new:
+        return LINE_NEW
+
+    total = len(norm_active) + len(norm_new)
+    if 2.0 * min(len(norm_active), len(norm_new)) / total <= CORRECTION_SIMILARITY:
+        return LINE_NEW
+
+    if len(norm_new) < AUTOJUNK_MIN_LENGTH:
+        size = max(
+            _common_prefix_len(norm_active, norm_new),
+            _common_suffix_len(norm_active, norm_new),
+        )
+        if 2.0 * size / total > CORRECTION_SIMILARITY:
+            return LINE_CORRECTION
+        first = _first_block(norm_active, norm_new, size) if size else None
+        if first is not None:
+            i, j = first
+            head = (norm_active[:i], norm_new[:j])
+            tail = (norm_active[i + size :], norm_new[j + size :])
+            most = size + min(map(len, head)) + min(map(len, tail))
+            if 2.0 * most / total <= CORRECTION_SIMILARITY:
+                return LINE_NEW
+            matched = size + _matched_chars(*head) + _matched_chars(*tail)
+            if 2.0 * matched / total > CORRECTION_SIMILARITY:
+                return LINE_CORRECTION
+            return LINE_NEW
+
+    similarity = SequenceMatcher(None, norm_active, norm_new).ratio()
+    if similarity > CORRECTION_SIMILARITY:
+        return LINE_CORRECTION
+    return LINE_NEW
+
+
+def is_meeting_window(window_name):
+    return "Meeting" in window_name or "Reunión" in window_name
+
+
+class TeamsWindowLocator:
+    """Caches the Teams meeting windows so every poll does not re-enumerate TeamsWebView."""
+
+    def __init__(self):
+        self.windows = []
+        self.last_refresh = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _discover(self):
+        roots = auto.WindowControl(
+            searchDepth=1, ClassName="TeamsWebView"
+        ).GetChildren()
+        sorted_wins = sorted(
+            roots,
+            key=lambda w: 0 if is_meeting_window(w.Name) else 1,
+        )
+        return [win for win in sorted_wins if "Chat" not in win.Name]
+
+    def get_windows(self, refresh=False):
+        # Re-enumerate on demand, when a window closed or periodically to catch new ones
+        expired = time.time() - self.last_refresh > WINDOW_REFRESH_SECONDS
+        if (
+            refresh
+            or expired
+            or not self.windows
+            or not all(win.Exists(0, 0) for win in self.windows)
+        ):
+            self.misses += 1
+            self.windows = self._discover()
+            self.last_refresh = time.time()
+        else:
+            self.hits += 1
+        return self.windows
+
+
+# Shared by the capture source and get_meeting_name()
+window_locator = TeamsWindowLocator()
+
+
+class WindowCaptionCache:
+    """Caption container remembered for one meeting window."""
+
+    def __init__(self, window, root, container, path):
+        self.window = window
+        self.root = root  # RootWebArea (or the window) the path starts from
+        self.container = container
+        self.path = path  # Child indexes from root to container
+        self.runtime_id = container.GetRuntimeId()
+
+
+class TeamsUIACaptionSource(CaptionSource):
+    """
+    Reads the live captions straight from the Teams accessibility tree.
+
+    Every meeting window is read once per tick. The first successful walk of a
+    window remembers its caption container (element, runtime ID and child-index
+    path from RootWebArea); later polls only re-read that subtree and fall back
+    to a full walk when the cached element goes stale. Windows without captions
+    are re-walked at most every EMPTY_WINDOW_RECHECK seconds; windows that have
+    never shown one and are not titled as a meeting back off exponentially up
+    to EMPTY_WINDOW_RECHECK_MAX.
+    """
+
+    requires_uia = True
+
+    def __init__(self, locator=None):
+        super().__init__()
+        self.locator = locator or window_locator
+        self.caches = {}  # window_key -> WindowCaptionCache
+        self.empty_until = {}  # window_key -> time of the next walk
+        self.empty_walks = {}  # window_key -> walks without captions so far
+        self.captioned = set()  # window_keys that have shown captions
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def watch_targets(self):
+        return tuple(cache.container for cache in self.caches.values())
+
+    @staticmethod
+    def _window_key(win):
+        return "-".join(str(part) for part in win.GetRuntimeId())
+
+    def read_windows(self):
+        frames = {}
+        try:
+            windows = self.locator.get_windows()
+        except:
+            return frames
+
+        for win in windows:
+            window_key = None
+            try:
+                window_key = self._window_key(win)
+                speaker, text = self._read_window(window_key, win)
+                frames[window_key] = (win.Name, speaker, text)
+            except:
+                if window_key is not None:
+                    self.caches.pop(window_key, None)
+                continue
+
+        # Forget windows that closed
+        for window_key in set(self.caches) - set(frames):
+            del self.caches[window_key]
+        for window_key in set(self.empty_until) - set(frames):
+            del self.empty_until[window_key]
+            self.empty_walks.pop(window_key, None)
+        return frames
+
+    def read(self):
+        # Single-window view: first window showing a caption (meeting windows first)
+        for window_name, speaker, text in self.read_windows().values():
+            if text:
+                self.window_name = window_name
+                return speaker, text
+        return None, None
+
+    def _read_window(self, window_key, win):
+        cache = self.caches.get(window_key)
+        if cache is not None:
+            caption = self._read_cached(cache)
+            if caption is not None:
+                self.cache_hits += 1
+                return caption
+            del self.caches[window_key]
+
+        if time.time() < self.empty_until.get(window_key, 0):
+            return None, None
+        self.cache_misses += 1
+        caption = self._full_walk(window_key, win)
+        if caption[1] is not None:
+            self.captioned.add(window_key)
+            self.empty_walks.pop(window_key, None)
+        elif window_key in self.captioned or is_meeting_window(win.Name):
+            self.empty_until[window_key] = time.time() + EMPTY_WINDOW_RECHECK
+        else:
+            walks = self.empty_walks.get(window_key, 0)
+            self.empty_walks[window_key] = walks + 1
+            delay = min(EMPTY_WINDOW_RECHECK * 2**walks, EMPTY_WINDOW_RECHECK_MAX)
+            self.empty_until[window_key] = time.time() + delay
+        return caption
+
+    # === CACHED PATH ===
+
+    def _read_cached(self, cache):
+        # Returns None when the cache is stale so the caller falls back to a walk
+        if not cache.window.Exists(0, 0):
+            return None
+        if not cache.container.Exists(0, 0):
+            container = self._resolve_path(cache)
+            if container is None:
+                return None
+            cache.container = container
+
+        candidates = []
+        for group in cache.container.GetChildren():
+            caption = self._caption_from_group(group, group.GetChildren())
+            if caption:
+                candidates.append(caption)
+        if not candidates:
+            return None
+        return candidates[-1]
+
+    @staticmethod
+    def _resolve_path(cache):
+        # Cheap re-resolution: follow the remembered child indexes from the web area
+        control = cache.root
+        for index in cache.path:
+            children = control.GetChildren()
+            if index >= len(children):
+                return None
+            control = children[index]
+        if control.GetRuntimeId() != cache.runtime_id:
+            return None
+        return control
+
+    # === FULL WALK ===
+
+    def _full_walk(self, window_key, win):
+        if not win.Exists(0, 0):
+            return None, None
+        web_area = win.DocumentControl(searchDepth=15, AutomationId="RootWebArea")
+        if not web_area.Exists(0, 0):
+            web_area = win
+
+        candidates = []
+        try:
+            children = web_area.GetChildren()
+        except:
+            return None, None
+        self._scan(web_area, children, 0, (), candidates)
+        if not candidates:
+            return None, None
+        speaker, txt, path, container = candidates[-1]
+        self.caches[window_key] = WindowCaptionCache(win, web_area, container, path)
+        return speaker, txt
+
+    def _scan(self, control, children, depth, path, found):
+        # Depth-first walk (same order as auto.WalkControl) that tracks child
+        # indexes; each node's children are fetched once, by its parent's loop
+        for index, child in enumerate(children):
+            child_path = path + (index,)
+            try:
+                is_group = child.ControlTypeName == "GroupControl"
+                if not is_group and depth + 1 >= CAPTION_SEARCH_DEPTH:
+                    continue
+                grandchildren = child.GetChildren()
+                if is_group:
+                    caption = self._caption_from_group(child, grandchildren)
+                    if caption:
+                        found.append((*caption, path, control))
+            except:
+                continue
+            if depth + 1 < CAPTION_SEARCH_DEPTH:
+                self._scan(child, grandchildren, depth + 1, child_path, found)
+
+    @staticmethod
+    def _caption_from_group(group, children):
+        if group.ControlTypeName != "GroupControl" or len(children) < 2:
+            return None
+        node_name = children[0]
+        node_text = children[1]
+        if (
+            node_name.ControlTypeName == "TextControl"
+            and node_text.ControlTypeName == "TextControl"
+        ):
+            txt = node_text.Name
+            if txt and "Micrófono" not in txt:
+                return node_name.Name, txt
+        return None
+
+
+_uia_handler_class = None
+
+
+def _uia_event_handler_class():
+    # comtypes.gen.UIAutomationClient only exists once uiautomation has loaded it
+    global _uia_handler_class
+    if _uia_handler_class is None:
+        import comtypes
+        from comtypes.gen import UIAutomationClient as uia_client
+
+        class UIAEventHandler(comtypes.COMObject):
+            _com_interfaces_ = [
+                uia_client.IUIAutomationEventHandler,
+                uia_client.IUIAutomationPropertyChangedEventHandler,
+                uia_client.IUIAutomationStructureChangedEventHandler,
+            ]
+
+            def __init__(self, callback):
+                super().__init__()
+                self.callback = callback
+
+            def HandleAutomationEvent(self, sender, eventId):
+                self.callback()
+
+            def HandlePropertyChangedEvent(self, sender, propertyId, newValue):
+                self.callback()
+
+            def HandleStructureChangedEvent(self, sender, changeType, runtimeId):
+                self.callback()
+
+        _uia_handler_class = UIAEventHandler
+    return _uia_handler_class
+
+
+class TeamsUIAChangeNotifier(CaptionChangeNotifier):
+    """Subscribes to text, Name and structure changes under each caption container."""
 
-class TeamsRecorderSmart:
     def __init__(self):
-        self.start_time = time.time()
-        self.last_activity_time = time.time()
+        super().__init__()
+        self.handler = None
+        self.subscriptions = {}  # runtime id -> container
+        self.failed = set()  # runtime ids left on polling fallback
+
+    def watch(self, targets):
+        wanted = {}
+        for target in targets or ():
+            try:
+                wanted[tuple(target.GetRuntimeId())] = target
+            except:
+                continue
+
+        for runtime_id in set(self.subscriptions) - set(wanted):
+            self._unsubscribe(self.subscriptions.pop(runtime_id))
+        self.failed &= set(wanted)
+
+        for runtime_id, target in wanted.items():
+            if runtime_id in self.subscriptions or runtime_id in self.failed:
+                continue
+            try:
+                self._subscribe(target)
+                self.subscriptions[runtime_id] = target
+            except:
+                # Polling fallback; retried only when the container changes
+                self._unsubscribe(target)
+                self.failed.add(runtime_id)
+
+        return bool(wanted) and not self.failed
+
+    def _subscribe(self, target):
+        import ctypes
+
+        client = auto._AutomationClient.instance().IUIAutomation
+        element = target.Element
+        if self.handler is None:
+            self.handler = _uia_event_handler_class()(self.notify)
+
+        client.AddAutomationEventHandler(
+            auto.EventId.Text_TextChangedEvent,
+            element,
+            auto.TreeScope.Subtree,
+            None,
+            self.handler,
+        )
+        properties = (ctypes.c_int * 1)(auto.PropertyId.NameProperty)
+        client.AddPropertyChangedEventHandlerNativeArray(
+            element, auto.TreeScope.Subtree, None, self.handler, properties, 1
+        )
+        client.AddStructureChangedEventHandler(
+            element, auto.TreeScope.Subtree, None, self.handler
+        )
+
+    def _unsubscribe(self, target):
+        if self.handler is None:
+            return
+        client = auto._AutomationClient.instance().IUIAutomation
+        element = target.Element
+        for remove in (
+            lambda: client.RemoveAutomationEventHandler(
+                auto.EventId.Text_TextChangedEvent, element, self.handler
+            ),
+            lambda: client.RemovePropertyChangedEventHandler(element, self.handler),
+            lambda: client.RemoveStructureChangedEventHandler(element, self.handler),
+        ):
+            try:
+                remove()
+            except:
+                continue
+
+    def close(self):
+        for target in self.subscriptions.values():
+            self._unsubscribe(target)
+        self.subscriptions = {}
+        self.failed = set()
+
+
+class CaptureScheduler:
+    """
+    Decides how long the capture loop sleeps between ticks.
+
+    Captions changing -> POLL_INTERVAL_ACTIVE. Unchanged frames and missing
+    captions back off exponentially to their own ceilings. The interval never
+    drops below the one that keeps tick CPU time within cpu_budget per second.
+    Effective poll rate and per-tick cost are published every stats window.
+    """
+
+    def __init__(self, cpu_budget=CPU_BUDGET, on_stats=None):
+        self.cpu_budget = cpu_budget
+        self.on_stats = on_stats
+        self.interval = POLL_INTERVAL_ACTIVE
+
+        self.poll_rate_hz = 0.0
+        self.tick_seconds = 0.0  # Average wall time per tick in the last window
+        self.cpu_seconds = 0.0  # Average thread CPU time per tick in the last window
+        self.cpu_load = 0.0  # Capture-thread CPU seconds per wall second
+
+        self._tick_wall = 0.0
+        self._tick_cpu = 0.0
+        self._window_start = time.perf_counter()
+        self._window_ticks = 0
+        self._window_wall = 0.0
+        self._window_cpu = 0.0
+
+    def begin_tick(self):
+        self._tick_wall = time.perf_counter()
+        self._tick_cpu = time.thread_time()
+
+    def end_tick(self, changed, caption_present):
+        wall = time.perf_counter() - self._tick_wall
+        cpu = time.thread_time() - self._tick_cpu
+
+        if changed:
+            self.interval = POLL_INTERVAL_ACTIVE
+        elif caption_present:
+            self.interval = min(self.interval * 1.5, POLL_INTERVAL_IDLE_MAX)
+        else:
+            self.interval = min(self.interval * 2, POLL_INTERVAL_ABSENT_MAX)
+        self.interval = max(self.interval, self.budget_interval(cpu))
+
+        self._record(wall, cpu)
+
+    def budget_interval(self, cpu=None):
+        # Sleep needed after a tick so cpu / (cpu + sleep) stays within budget
+        cpu = self.cpu_seconds if cpu is None else cpu
+        if self.cpu_budget <= 0:
+            return 0.0
+        return max(0.0, cpu / self.cpu_budget - cpu)
+
+    def _record(self, wall, cpu):
+        self._window_ticks += 1
+        self._window_wall += wall
+        self._window_cpu += cpu
+
+        elapsed = time.perf_counter() - self._window_start
+        if elapsed < SCHEDULER_STATS_WINDOW:
+            return
+        self.poll_rate_hz = self._window_ticks / elapsed
+        self.tick_seconds = self._window_wall / self._window_ticks
+        self.cpu_seconds = self._window_cpu / self._window_ticks
+        self.cpu_load = self._window_cpu / elapsed
+
+        self._window_start = time.perf_counter()
+        self._window_ticks = 0
+        self._window_wall = 0.0
+        self._window_cpu = 0.0
+        if self.on_stats:
+            self.on_stats(self)
+
+
+class SegmentationPolicy:
+    """
+    Block size driven by AI backpressure.
+
+    The AI side reports each segment latency; backlog() returns the blocks
+    queued or still running. When the estimated delay of a new block
+    (backlog ahead of it times latency, spread over the parallel slots) passes
+    MAX_MINUTE_DELAY, blocks grow so the model gets fewer, larger calls. While
+    the model sits idle they shrink back for fresher minutes. The word
+    threshold always stays within BLOCK_WORDS_MIN..BLOCK_WORDS_MAX.
+    """
+
+    def __init__(self, backlog=None, slots=1):
+        self.backlog = backlog or (lambda: 0)
+        self.slots = max(1, slots)
+        self.word_threshold = WORD_THRESHOLD
+        self.latency = None  # Smoothed seconds per segment
+
+    def report_latency(self, seconds):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+
+    def estimated_delay(self):
+        if self.latency is None:
+            return 0.0
+        return self.latency * (self.backlog() + 1) / self.slots
+
+    def on_block(self):
+        # One step per committed block keeps the size from oscillating per tick
+        if self.estimated_delay() > MAX_MINUTE_DELAY:
+            grown = int(self.word_threshold * BLOCK_GROWTH)
+            self.word_threshold = min(BLOCK_WORDS_MAX, grown)
+        elif self.backlog() == 0:
+            shrunk = int(self.word_threshold / BLOCK_GROWTH)
+            self.word_threshold = max(BLOCK_WORDS_MIN, shrunk)
+
+
+class TeamsRecorderSmart:
+    def __init__(
+        self,
+        source=None,
+        meeting_id=DEFAULT_WINDOW_KEY,
+        payload_budget=DEFAULT_PAYLOAD_TOKEN_BUDGET,
+        segmentation=None,
+    ):
+        self.source = source or TeamsUIACaptionSource()
+        self.payload_budget = payload_budget  # Token budget of each ai_payload
+        self.segmentation = (
+            segmentation  # SegmentationPolicy; None = fixed WORD_THRESHOLD
+        )
+        self.meeting_id = meeting_id  # Window key; tags every packet of this meeting
+        self.block_seq = 0  # Order of blocks within this meeting, stamped on commit
+        self.start_time = self.source.now()
+        self.last_activity_time = self.source.now()
 
         # Buffer Logic
         self.committed_lines = []  # Lines that are finished/stable
         self.active_line = ""  # Current line being spoken/modified by Teams
+        self.committed_word_count = 0  # Running totals so snapshot checks are O(1)
+        self.active_word_count = 0
+        self.norm_active_line = ""  # Normalized active line, cached for update()
+
+        # Live view: cleaned committed lines survive block commits; serial counts them
+        self.live_lines = deque(maxlen=LIVE_VIEW_LINES)
+        self.live_serial = 0
         self.active_speaker = ""
 
         self.previous_context = ""
         self.snapshots = deque(maxlen=50)
         self.window_name = "Buscando Teams..."
         self.last_raw_capture = ""  # To avoid processing identical frames
+        self.caption_present = False  # Last poll found a caption on screen
 
         # Load Dictionary
         self.glossary_data = self._load_glossary()
         self.glossary_keys = list(self.glossary_data.keys())
-        self.compiled_rules = self._compile_glossary_rules()
+        self.glossary = GlossaryEngine(self.glossary_data)
+        self.fuzzy_index = FuzzyTermIndex(self.glossary_keys, FUZZY_THRESHOLD)
 
     def _load_glossary(self):
         path = os.path.join(os.path.dirname(__file__), "technical_glossary.json")
@@ -50,70 +674,35 @@ class TeamsRecorderSmart:
                 return {}
         return {}
 
-    def _compile_glossary_rules(self):
-        # Compile explicit regex aliases for fast replacement
-        rules = []
-        for correct_word, data in self.glossary_data.items():
-            aliases = data.get("aliases", [])
-            live_replace = data.get("live_replace", False)
-            if not aliases:
-                continue
-
-            aliases.sort(key=len, reverse=True)
-            pattern_str = r"(?i)\b(" + "|".join(map(re.escape, aliases)) + r")\b"
-            rules.append((re.compile(pattern_str), correct_word, live_replace))
-        return rules
-
     # === TEXT PROCESSING UTILS ===
 
     def _normalize_text(self, text):
         # Strip punctuation and lowercase for logical comparison
         if not text:
             return ""
-        translator = str.maketrans("", "", string.punctuation)
-        return " ".join(text.translate(translator).lower().split())
-
-    def _fix_versions_dynamic(self, text):
-        # Regex for b 1 -> v1
-        return re.sub(r"(?i)\b[bB]\s?[\-]?\s?(\d+)\b", r"v\1", text)
+        return " ".join(text.translate(_PUNCTUATION_TABLE).lower().split())
 
     def _generate_live_clean_text(self, text):
-        # Fast cleanup for UI/Human readability
+        # Fast cleanup for UI/Human readability (b 1 -> v1 + live_replace aliases)
         if not text:
             return ""
-        clean = text
-        clean = self._fix_versions_dynamic(clean)
-        for pattern, correct, do_replace in self.compiled_rules:
-            if do_replace:
-                clean = pattern.sub(correct, clean)
-        return clean
+        return self.glossary.clean(text)
 
     def _fuzzy_scan_for_hints(self, text):
-        # Deep scan for AI suggestions (heavy operation, run only on commit)
-        matches = set()
+        # Deep scan for AI suggestions (indexed, run only on commit)
         words = re.findall(r"\b[a-zA-Záéíóúñ]{4,}\b", text)
+        return self.fuzzy_index.scan(words)
 
-        for word in words:
-            for key in self.glossary_keys:
-                if word.lower() == key.lower():
-                    continue
-                # Fuzzy matching ratio
-                if (
-                    SequenceMatcher(None, word.lower(), key.lower()).ratio()
-                    >= FUZZY_THRESHOLD
-                ):
-                    matches.add((word, key))
-        return matches
-
-    def _generate_ai_suggestions(self, text):
+    def _generate_ai_suggestions(self, text, scan=None):
         if not text:
             return []
         suggestions = []
         seen_concepts = set()
+        if scan is None:
+            scan = self.glossary.scan(text)
 
         # 1. Version Detection
-        version_matches = re.findall(r"(?i)\b[bB]\s?[\-]?\s?(\d+)\b", text)
-        for num in set(version_matches):
+        for num in scan.versions:
             concept_id = f"VER_{num}"
             if concept_id not in seen_concepts:
                 suggestions.append(
@@ -122,14 +711,13 @@ class TeamsRecorderSmart:
                 seen_concepts.add(concept_id)
 
         # 2. Explicit Alias Detection
-        for pattern, correct, _ in self.compiled_rules:
-            if pattern.search(text):
-                concept_id = f"TERM_{correct.upper()}"
-                if concept_id not in seen_concepts:
-                    suggestions.append(
-                        f"- Se detectó término similar a '{correct}' (según diccionario)."
-                    )
-                    seen_concepts.add(concept_id)
+        for correct in scan.terms:
+            concept_id = f"TERM_{correct.upper()}"
+            if concept_id not in seen_concepts:
+                suggestions.append(
+                    f"- Se detectó término similar a '{correct}' (según diccionario)."
+                )
+                seen_concepts.add(concept_id)
 
         # 3. Fuzzy Detection
         fuzzy_hits = self._fuzzy_scan_for_hints(text)
@@ -146,59 +734,55 @@ class TeamsRecorderSmart:
     # === CORE CAPTURE LOGIC ===
 
     def _get_caption(self):
-        try:
-            roots = auto.WindowControl(
-                searchDepth=1, ClassName="TeamsWebView"
-            ).GetChildren()
-            sorted_wins = sorted(
-                roots,
-                key=lambda w: 0 if "Meeting" in w.Name or "Reunión" in w.Name else 1,
-            )
-            for win in sorted_wins:
-                if "Chat" in win.Name:
-                    continue
-                try:
-                    if not win.Exists(0, 0):
-                        continue
-                    web_area = win.DocumentControl(
-                        searchDepth=15, AutomationId="RootWebArea"
-                    )
-                    if not web_area.Exists(0, 0):
-                        web_area = win
-                except:
-                    continue
-
-                candidates = []
-                for control, depth in auto.WalkControl(web_area, maxDepth=14):
-                    try:
-                        if control.ControlTypeName == "GroupControl":
-                            children = control.GetChildren()
-                            if len(children) >= 2:
-                                node_name = children[0]
-                                node_text = children[1]
-                                if (
-                                    node_name.ControlTypeName == "TextControl"
-                                    and node_text.ControlTypeName == "TextControl"
-                                ):
-                                    txt = node_text.Name
-                                    if txt and "Micrófono" not in txt:
-                                        candidates.append((node_name.Name, txt))
-                    except:
-                        continue
-                if candidates:
-                    self.window_name = win.Name
-                    return candidates[-1]
-        except:
-            return None, None
-        return None, None
+        speaker, text = self.source.read()
+        self.window_name = self.source.window_name
+        return speaker, text
 
     def _count_words(self):
         # Count words in committed lines + current active line
-        full_text = " ".join(self.committed_lines) + " " + self.active_line
-        return len(full_text.split())
+        return self.committed_word_count + self.active_word_count
+
+    def _set_active_line(self, text, normalized=None):
+        self.active_line = text
+        self.active_word_count = len(text.split())
+        if normalized is None:
+            normalized = self._normalize_text(text)
+        self.norm_active_line = normalized
+
+    def _commit_active_line(self):
+        line = f"[{self.active_speaker}]: {self.active_line}"
+        self.committed_lines.append(line)
+        self.committed_word_count += len(line.split())
+        # Clean once at commit time; the live view reuses it on every frame
+        self.live_lines.append(self._generate_live_clean_text(line))
+        self.live_serial += 1
+
+    def render_active_line(self):
+        if not self.active_line:
+            return ""
+        return self._generate_live_clean_text(
+            f"[{self.active_speaker}]: {self.active_line}"
+        )
+
+    def render_live_view(self):
+        return "\n".join([*self.live_lines, self.render_active_line()]).rstrip("\n")
+
+    def live_delta_since(self, serial):
+        # Committed lines added after `serial` plus the current active line;
+        # serial=None asks for the whole view and tells the panel to reset first
+        if serial is None:
+            return {
+                "reset": True,
+                "committed": list(self.live_lines),
+                "active": self.render_active_line(),
+            }
+        missing = min(self.live_serial - serial, len(self.live_lines))
+        committed = list(self.live_lines)[len(self.live_lines) - missing :]
+        return {"committed": committed, "active": self.render_active_line()}
 
     def update(self):
         speaker, raw_text = self._get_caption()
+        self.caption_present = bool(raw_text)
 
         # Basic validation
         if not raw_text or speaker in EXCLUDED_SPEAKERS:
@@ -212,7 +796,7 @@ class TeamsRecorderSmart:
         if current_frame_signature == self.last_raw_capture:
             return False
         self.last_raw_capture = current_frame_signature
-        self.last_activity_time = time.time()
+        self.last_activity_time = self.source.now()
 
         # === SLIDING WINDOW LOGIC ===
 
@@ -220,46 +804,40 @@ class TeamsRecorderSmart:
         if speaker != self.active_speaker:
             # Commit previous speaker's active line if exists
             if self.active_line:
-                self.committed_lines.append(
-                    f"[{self.active_speaker}]: {self.active_line}"
-                )
+                self._commit_active_line()
 
             # Start new speaker block
             self.active_speaker = speaker
-            self.active_line = clean_text
+            self._set_active_line(clean_text)
             return True
 
         # 2. Same speaker: Check if it's an update to the active line
         # Logic: If the new text contains the old text (growth) OR shares significant overlap
-        norm_active = self._normalize_text(self.active_line)
         norm_new = self._normalize_text(clean_text)
+        change = classify_line_change(self.norm_active_line, norm_new)
 
         # Case A: Growth (Teams appended words)
-        if norm_active in norm_new:
-            self.active_line = clean_text  # Update active line to the fuller version
-            return True
-
         # Case B: Correction (Teams changed words but context is same)
-        # Use SequenceMatcher only if lengths are comparable to avoid heavy calc on disjoint strings
-        if len(norm_new) > 0 and len(norm_active) > 0:
-            similarity = SequenceMatcher(None, norm_active, norm_new).ratio()
-            if similarity > 0.65:  # Loose threshold for corrections
-                self.active_line = clean_text
-                return True
+        if change in (LINE_GROWTH, LINE_CORRECTION):
+            self._set_active_line(clean_text, norm_new)
+            return True
 
         # Case C: New Sentence (Teams cleared buffer or started new sentence)
         # Commit the old active line and start a new one
         if self.active_line:
-            self.committed_lines.append(f"[{self.active_speaker}]: {self.active_line}")
+            self._commit_active_line()
 
-        self.active_line = clean_text
+        self._set_active_line(clean_text, norm_new)
         return True
 
     def check_snapshot(self, force_flush=False):
         current_word_count = self._count_words()
-        time_since_activity = time.time() - self.last_activity_time
+        time_since_activity = self.source.now() - self.last_activity_time
 
-        is_volume = current_word_count >= WORD_THRESHOLD
+        word_threshold = WORD_THRESHOLD
+        if self.segmentation is not None:
+            word_threshold = self.segmentation.word_threshold
+        is_volume = current_word_count >= word_threshold
         is_silence = (time_since_activity > SILENCE_TIMEOUT) and (
             current_word_count >= MIN_WORDS_FOR_TIMEOUT
         )
@@ -267,38 +845,65 @@ class TeamsRecorderSmart:
         if is_volume or is_silence or (force_flush and current_word_count > 0):
             # Before committing, ensure active line is pushed to committed
             if self.active_line:
-                self.committed_lines.append(
-                    f"[{self.active_speaker}]: {self.active_line}"
-                )
-                self.active_line = ""
+                self._commit_active_line()
+                self._set_active_line("")
                 self.active_speaker = ""
 
+            if self.segmentation is not None:
+                self.segmentation.on_block()
             return self._commit_block(current_word_count)
         return None
 
     def _commit_block(self, count):
-        timestamp = time.strftime("%H:%M")
+        timestamp = time.strftime("%H:%M", time.localtime(self.source.now()))
+        seq = self.block_seq
+        self.block_seq += 1
 
         # Join all committed lines
         raw_forensic = "\n".join(self.committed_lines)
 
-        # Generate Derived Outputs
-        live_clean = self._generate_live_clean_text(raw_forensic)
-        hints = self._generate_ai_suggestions(raw_forensic)
+        # Generate Derived Outputs (one glossary pass feeds both)
+        scan = self.glossary.scan(raw_forensic)
+        live_clean = scan.clean_text
+        hints = self._generate_ai_suggestions(raw_forensic, scan)
 
-        hints_block = ""
-        if hints:
-            hints_block = "\n--- SUGERENCIAS DEL SENSOR (GLOSARIO) ---\n" + "\n".join(
-                hints
-            )
-
-        ai_payload_str = f"=== REUNIÓN: {self.window_name} ===\n"
+        # Sections claim the token budget in priority order: segment, context, hints
+        sections = [
+            PayloadSection("reunión", f"=== REUNIÓN: {self.window_name} ==="),
+            PayloadSection(
+                "segmento",
+                f"--- SEGMENTO ACTUAL ({count} palabras) ---",
+                raw_forensic,
+                priority=1,
+            ),
+            PayloadSection(
+                "sugerencias",
+                "\n--- SUGERENCIAS DEL SENSOR (GLOSARIO) ---",
+                "\n".join(hints),
+                priority=3,
+                keep="lines",
+            ),
+        ]
         if self.previous_context:
-            ai_payload_str += f"--- CONTEXTO PREVIO ---\n...{self.previous_context}\n"
+            sections.insert(
+                1,
+                PayloadSection(
+                    "contexto",
+                    "--- CONTEXTO PREVIO ---",
+                    f"...{self.previous_context}",
+                    priority=2,
+                    keep="tail",
+                ),
+            )
+        if not hints:
+            sections.pop()
+        payload = build_payload(sections, self.payload_budget)
+        meta = f"Words: {count} | Tokens: {payload.tokens}"
+        if payload.trimmed:
+            meta += f" | recortado: {', '.join(payload.trimmed)}"
 
-        ai_payload_str += f"--- SEGMENTO ACTUAL ({count} palabras) ---\n{raw_forensic}"
-        if hints_block:
-            ai_payload_str += f"\n{hints_block}"
+        # Parts kept separately so the AI side can merge queued blocks
+        context_sent = self.previous_context
 
         # Context Handover
         words = raw_forensic.split()
@@ -307,15 +912,22 @@ class TeamsRecorderSmart:
 
         self.previous_context = new_overlap
         self.committed_lines = []  # Clear committed
+        self.committed_word_count = 0
         # Note: active_line is already cleared in check_snapshot
-        self.start_time = time.time()
+        self.start_time = self.source.now()
 
         return {
             "ts": timestamp,
             "raw_forensic": raw_forensic,
             "live_clean": live_clean,
-            "ai_payload": ai_payload_str,
-            "meta_header": f"--- BLOQUE {timestamp} (Words: {count}) ---",
+            "ai_payload": payload.text,
+            "prompt_tokens": payload.tokens,
+            "previous_context": context_sent,
+            "hints": hints,
+            "meta_header": f"--- BLOQUE {timestamp} ({meta}) ---",
+            "meeting_id": self.meeting_id,
+            "meeting_name": self.window_name,
+            "seq": seq,
         }
 
     def flush(self):
@@ -328,16 +940,7 @@ class TeamsRecorderSmart:
 def get_meeting_name():
     try:
         with auto.UIAutomationInitializerInThread():
-            roots = auto.WindowControl(
-                searchDepth=1, ClassName="TeamsWebView"
-            ).GetChildren()
-            sorted_wins = sorted(
-                roots,
-                key=lambda w: 0 if "Meeting" in w.Name or "Reunión" in w.Name else 1,
-            )
-            for win in sorted_wins:
-                if "Chat" in win.Name:
-                    continue
+            for win in window_locator.get_windows():
                 if win.Exists(0, 0):
                     return win.Name
     except:
@@ -346,12 +949,29 @@ def get_meeting_name():
 
 
 def start_headless_capture(
-    on_block_complete_callback, on_live_update_callback, stop_event
+    on_block_complete_callback,
+    on_live_update_callback,
+    stop_event,
+    source=None,
+    notifier=None,
+    live_delta=False,
+    scheduler=None,
+    payload_budget=DEFAULT_PAYLOAD_TOKEN_BUDGET,
+    segmentation=None,
 ):
+    # live_delta=True sends {"committed": [...new lines], "active": str} instead of the full view
     block_queue = queue.Queue()
+    capture_done = threading.Event()
+    source = source or TeamsUIACaptionSource()
+    if notifier is None and source.requires_uia and CAPTURE_MODE == "events":
+        notifier = TeamsUIAChangeNotifier()
+    # Replays keep the fixed interval unless a scheduler is passed explicitly
+    if scheduler is None and source.requires_uia:
+        scheduler = CaptureScheduler()
 
     def worker():
-        while not stop_event.is_set() or not block_queue.empty():
+        # Runs until the capture loop has flushed every recorder and the queue is drained
+        while not capture_done.is_set() or not block_queue.empty():
             try:
                 payload = block_queue.get(timeout=1)
                 on_block_complete_callback(payload)
@@ -362,30 +982,72 @@ def start_headless_capture(
     dispatch_thread = threading.Thread(target=worker, daemon=True)
     dispatch_thread.start()
 
-    with auto.UIAutomationInitializerInThread():
-        recorder = TeamsRecorderSmart()
+    uia_scope = (
+        auto.UIAutomationInitializerInThread() if source.requires_uia else nullcontext()
+    )
+    with uia_scope:
+        # One recorder per meeting window, all fed from a single read per tick
+        recorders = {}  # window_key -> TeamsRecorderSmart
+        live_key = None  # Window shown on the live panel (last one that changed)
+        sent_serial = None
         try:
-            while not stop_event.is_set():
-                if recorder.update():
-                    # LIVE FEED: Show committed lines + current active line
-                    if on_live_update_callback:
-                        # Combine history with the fluctuating active line
-                        current_view = list(recorder.committed_lines[-8:])
-                        if recorder.active_line:
-                            current_view.append(
-                                f"[{recorder.active_speaker}]: {recorder.active_line}"
-                            )
-
-                        raw_buffer = "\n".join(current_view)
-                        clean_visual = recorder._generate_live_clean_text(raw_buffer)
-                        on_live_update_callback(clean_visual)
-
-                payload = recorder.check_snapshot()
-                if payload:
-                    block_queue.put(payload)
-                time.sleep(0.1)
+            # Replay sources end on their own; live sources run until stopped
+            while not stop_event.is_set() and not source.exhausted:
+                if scheduler is not None:
+                    scheduler.begin_tick()
+
+                frames = source.read_windows()
+                for window_key, (_, _, text) in frames.items():
+                    # Windows get a recorder once they show a caption
+                    if text and window_key not in recorders:
+                        feed = WindowFeed(source, window_key)
+                        recorders[window_key] = TeamsRecorderSmart(
+                            feed, window_key, payload_budget, segmentation
+                        )
+
+                any_changed = False
+                any_present = False
+                for window_key, recorder in recorders.items():
+                    recorder.source.push(*frames.get(window_key, (None, None, None)))
+                    changed = recorder.update()
+                    any_changed = any_changed or changed
+                    any_present = any_present or recorder.caption_present
+
+                    if changed and on_live_update_callback:
+                        # LIVE FEED: cached committed lines + freshly cleaned active line
+                        if window_key != live_key:
+                            live_key, sent_serial = window_key, None
+                        if live_delta:
+                            delta = recorder.live_delta_since(sent_serial)
+                            sent_serial = recorder.live_serial
+                            on_live_update_callback(delta)
+                        else:
+                            on_live_update_callback(recorder.render_live_view())
+
+                    payload = recorder.check_snapshot()
+                    if payload:
+                        block_queue.put(payload)
+
+                if scheduler is not None:
+                    scheduler.end_tick(any_changed, any_present)
+
+                # Sleep until the captions change; poll while no subscription is live
+                if notifier is not None and notifier.watch(source.watch_targets):
+                    if scheduler is not None and scheduler.budget_interval() > 0:
+                        # Events arriving meanwhile stay flagged for the wait below
+                        source.wait(scheduler.budget_interval())
+                    source.wait_for_change(notifier, EVENT_FALLBACK_INTERVAL)
+                elif scheduler is not None:
+                    source.wait(scheduler.interval)
+                else:
+                    source.wait(POLL_INTERVAL)
         finally:
-            final_payload = recorder.flush()
-            if final_payload:
-                block_queue.put(final_payload)
+            for recorder in recorders.values():
+                final_payload = recorder.flush()
+                if final_payload:
+                    block_queue.put(final_payload)
+            capture_done.set()
+            if notifier is not None:
+                notifier.close()
+            source.close()
             dispatch_thread.join(timeout=2)
@@ -0,0 +1,129 @@
+import math
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tokens available for the user payload of each model (system prompt and answer
+# excluded). Local tokenizers differ from cl100k, so keep some margin.
+PAYLOAD_TOKEN_BUDGETS = {"local-model": 3000}
+DEFAULT_PAYLOAD_TOKEN_BUDGET = 3000
+TIKTOKEN_ENCODING = "cl100k_base"
+
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+_CHUNK_PATTERN = re.compile(r"\S+\s*")
+_encoding = None
+
+
+def payload_budget(model_name):
+    return PAYLOAD_TOKEN_BUDGETS.get(model_name, DEFAULT_PAYLOAD_TOKEN_BUDGET)
+
+
+def _get_encoding():
+    global _encoding, tiktoken
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except Exception:
+            tiktoken = None  # BPE file not cached and no network: use the estimator
+    return _encoding
+
+
+def count_tokens(text):
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Estimator: BPE vocabularies split Spanish words every ~4 characters and
+    # give each punctuation mark its own token
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECE_PATTERN.findall(text))
+
+
+def truncate_tokens(text, budget, keep="head"):
+    # Longest run of whole words (from the start or the end) that fits the budget
+    if count_tokens(text) <= budget:
+        return text
+    chunks = _CHUNK_PATTERN.findall(text)
+
+    def part(size):
+        return "".join(
+            chunks[:size] if keep == "head" else chunks[len(chunks) - size :]
+        )
+
+    low, high = 0, len(chunks)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(part(mid)) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return part(low).strip()
+
+
+def _fit_lines(lines, budget):
+    # Keeps leading lines while they fit; callers put the important ones first
+    kept, used = [], 0
+    for line in lines:
+        cost = count_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+class PayloadSection:
+    """
+    One part of a prompt. priority decides who gets the budget first (0 wins);
+    keep says how the body shrinks: "head"/"tail" drop words from the other
+    end, "lines" drops whole lines from the end.
+    """
+
+    def __init__(self, name, header, body=None, priority=0, keep="head"):
+        self.name = name
+        self.header = header
+        self.body = body
+        self.priority = priority
+        self.keep = keep
+
+    def render(self, body):
+        return self.header if body is None else f"{self.header}\n{body}"
+
+
+class PayloadBuild:
+    def __init__(self, text, tokens, trimmed):
+        self.text = text
+        self.tokens = tokens
+        self.trimmed = trimmed  # Names of the sections cut or dropped
+
+
+def build_payload(sections, budget):
+    # Allocates the budget by priority, renders in the original order
+    remaining = budget
+    rendered = {}
+    trimmed = []
+    for section in sorted(sections, key=lambda s: s.priority):
+        header_cost = count_tokens(section.header)
+        body_cost = count_tokens(section.body)
+        if header_cost + body_cost <= remaining:
+            rendered[id(section)] = section.render(section.body)
+            remaining -= header_cost + body_cost
+            continue
+
+        trimmed.append(section.name)
+        room = remaining - header_cost
+        if room <= 0 or section.body is None:
+            continue
+        if section.keep == "lines":
+            body = _fit_lines(section.body.split("\n"), room)
+        else:
+            body = truncate_tokens(section.body, room, section.keep)
+        if body:
+            rendered[id(section)] = section.render(body)
+            remaining -= header_cost + count_tokens(body)
+
+    text = "\n".join(rendered[id(s)] for s in sections if id(s) in rendered)
+    return PayloadBuild(text, count_tokens(text), trimmed)
@@ -0,0 +1,340 @@
+import contextlib
+import difflib
+import itertools
+import json
+import os
+import re
+import struct
+import zlib
+
+ARCHIVE_MAGIC = b"MCARCH1\n"
+INDEX_MAGIC = b"MCIX"
+FRAME_TARGET_BYTES = 64 * 1024  # Uncompressed text per independently compressed frame
+
+# Placeholder for a block's raw text inside an AI input template
+_REF = "\x00{}\x00"
+_REF_PATTERN = re.compile("\x00(\\d+)\x00")
+_BLOCK_HEADER = re.compile(r"^--- BLOQUES? .* ---$", re.MULTILINE)
+_BLOCK_TS = re.compile(r"^--- BLOQUE (\d{2}:\d{2}) ")
+_WORD = re.compile(r"\S+\s*|\s+")  # Word plus its trailing whitespace
+
+VIEWS = ("forensic", "live", "ai_input")
+
+
+class ArchiveError(Exception):
+    """Raised when a meeting folder cannot be archived without losing data."""
+
+
+def read_log(lines):
+    # "<file header><meta_header>\n<body>\n\n..." read line by line from a
+    # text file -> (file header, iterator of (meta, body))
+    header = []
+    meta_line = None
+    for line in lines:
+        if _BLOCK_HEADER.match(line):
+            meta_line = line
+            break
+        header.append(line)
+    return "".join(header), _log_entries(lines, meta_line)
+
+
+def _log_entries(lines, meta_line):
+    body = []
+    for line in lines:
+        if _BLOCK_HEADER.match(line):
+            yield _log_entry(meta_line, body)
+            meta_line, body = line, []
+        else:
+            body.append(line)
+    if meta_line is not None:
+        yield _log_entry(meta_line, body)
+
+
+def _log_entry(meta_line, body_lines):
+    meta = meta_line.rstrip("\n")
+    body = "".join(body_lines)
+    if not body.endswith("\n\n"):
+        raise ArchiveError(f"Unterminated entry: {meta}")
+    return meta, body[:-2]
+
+
+def live_edits(raw, live):
+    # Edits that turn the raw block into its glossary-cleaned view. The diff
+    # runs over words, so a block costs milliseconds instead of the
+    # character-level quadratic worst case; offsets stay in characters.
+    if raw == live:
+        return []
+    raw_words = _WORD.findall(raw)
+    live_words = _WORD.findall(live)
+    offsets = [0]
+    for word in raw_words:
+        offsets.append(offsets[-1] + len(word))
+    matcher = difflib.SequenceMatcher(None, raw_words, live_words, autojunk=False)
+    return [
+        [offsets[i1], offsets[i2], "".join(live_words[j1:j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_edits(raw, edits):
+    for i1, i2, replacement in reversed(edits):
+        raw = raw[:i1] + replacement + raw[i2:]
+    return raw
+
+
+class _Upcoming:
+    """One-record lookahead over the block records streamed from the logs."""
+
+    def __init__(self, records):
+        self.records = records
+        self.head = next(records, None)
+
+    def pop(self):
+        head = self.head
+        self.head = next(self.records, None)
+        return head
+
+
+def input_template(payload, upcoming):
+    # Replaces the raw text of the blocks sent in this payload by references;
+    # returns (template, blocks taken from upcoming)
+    template = payload
+    taken = []
+    while upcoming.head is not None:
+        raw = upcoming.head["raw"]
+        if not raw or raw not in template:
+            break
+        template = template.replace(raw, _REF.format(upcoming.head["seq"]), 1)
+        taken.append(upcoming.pop())
+    return template, taken
+
+
+class TranscriptArchiveWriter:
+    """
+    Writes one meeting as zlib frames of JSON records, then a compressed
+    index and an 8-byte trailer pointing at it.
+
+    Block records hold the raw transcript once, plus the edits for the live
+    view; input records hold the AI payloads with every raw segment replaced
+    by a reference, so both views are rebuilt from the raw text on read.
+    """
+
+    def __init__(self, path, headers):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.f = open(self.tmp_path, "wb")
+        self.f.write(ARCHIVE_MAGIC)
+        self.index = {"headers": headers, "frames": [], "timestamps": {}}
+        self.pending = []
+        self.pending_bytes = 0
+
+    def add(self, record):
+        self.pending.append(record)
+        self.pending_bytes += sum(len(v) for v in record.values() if isinstance(v, str))
+        if self.pending_bytes >= FRAME_TARGET_BYTES:
+            self._write_frame()
+
+    def _write_frame(self):
+        if not self.pending:
+            return
+        data = zlib.compress(
+            json.dumps(self.pending, ensure_ascii=False).encode("utf-8"), 9
+        )
+        offset = self.f.tell()
+        self.f.write(struct.pack(">I", len(data)))
+        self.f.write(data)
+        frame = len(self.index["frames"])
+        self.index["frames"].append(offset)
+        for record in self.pending:
+            if record["kind"] == "block" and record["ts"]:
+                frames = self.index["timestamps"].setdefault(record["ts"], [])
+                if frame not in frames:
+                    frames.append(frame)
+        self.pending = []
+        self.pending_bytes = 0
+
+    def close(self):
+        self._write_frame()
+        index_offset = self.f.tell()
+        self.f.write(zlib.compress(json.dumps(self.index).encode("utf-8"), 9))
+        self.f.write(struct.pack(">Q", index_offset) + INDEX_MAGIC)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.f.close()
+        os.remove(self.tmp_path)
+
+
+class TranscriptArchive:
+    """Random access reader: only the frames a lookup needs are decompressed."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ArchiveError(f"Not a transcript archive: {path}")
+            f.seek(-12, os.SEEK_END)
+            trailer = f.read(12)
+            if trailer[8:] != INDEX_MAGIC:
+                raise ArchiveError(f"Truncated archive: {path}")
+            index_offset = struct.unpack(">Q", trailer[:8])[0]
+            end = f.seek(0, os.SEEK_END) - 12
+            f.seek(index_offset)
+            self.index = json.loads(zlib.decompress(f.read(end - index_offset)))
+        self.headers = self.index["headers"]
+
+    @property
+    def timestamps(self):
+        return list(self.index["timestamps"])
+
+    def frame(self, number):
+        with open(self.path, "rb") as f:
+            f.seek(self.index["frames"][number])
+            (length,) = struct.unpack(">I", f.read(4))
+            return json.loads(zlib.decompress(f.read(length)))
+
+    def records(self):
+        for number in range(len(self.index["frames"])):
+            yield from self.frame(number)
+
+    def blocks_at(self, ts):
+        # Blocks stamped HH:MM, decompressing only the frames that hold them
+        for number in self.index["timestamps"].get(ts, []):
+            for record in self.frame(number):
+                if record["kind"] == "block" and record["ts"] == ts:
+                    yield record
+
+    def render_block(self, record, view):
+        if view == "live":
+            return apply_edits(record["raw"], record["live_edits"])
+        return record["raw"]
+
+    def render(self, view, out):
+        # Streams a whole log view to a text file object, exactly as written
+        out.write(self.headers[view])
+        raws = {}  # seq -> raw text of blocks not yet referenced by an input
+        for record in self.records():
+            if record["kind"] == "block":
+                if view == "ai_input":
+                    raws[record["seq"]] = record["raw"]
+                else:
+                    body = self.render_block(record, view)
+                    out.write(f"{record['meta']}\n{body}\n\n")
+            elif view == "ai_input":
+                payload = _REF_PATTERN.sub(
+                    lambda m: raws.pop(int(m.group(1))), record["template"]
+                )
+                out.write(f"{record['meta']}\n{payload}\n\n")
+
+
+def archive_path(files):
+    # Archive next to the three logs, with the same meeting-name prefix
+    return files["forensic"].replace("_RAW_FORENSE.txt", "_TRANSCRIPT.mcarch")
+
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _block_records(forensic, live):
+    # Pairs the forensic and live entries into archive block records
+    for seq, (raw_entry, live_entry) in enumerate(
+        itertools.zip_longest(forensic, live)
+    ):
+        if raw_entry is None or live_entry is None or raw_entry[0] != live_entry[0]:
+            raise ArchiveError("Forensic and live logs hold different blocks")
+        meta, raw = raw_entry
+        if "\x00" in raw:
+            raise ArchiveError("Raw transcript contains NUL characters")
+        match = _BLOCK_TS.match(meta)
+        yield {
+            "kind": "block",
+            "seq": seq,
+            "ts": match.group(1) if match else "",
+            "meta": meta,
+            "raw": raw,
+            "live_edits": live_edits(raw, live_entry[1]),
+        }
+
+
+class _LogComparer:
+    """Write-only text sink that checks a rendered view against its log file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.matches = True
+
+    def write(self, text):
+        if self.matches and self.f.read(len(text)) != text:
+            self.matches = False
+
+    def finished(self):
+        return self.matches and not self.f.read(1)
+
+
+def archive_meeting(files, remove_logs=True):
+    """
+    Packs the forensic, live and AI input logs of one meeting into a single
+    archive and checks that every view renders back byte for byte before the
+    text files are removed. Returns the archive path.
+
+    The logs are streamed entry by entry, so memory stays at about one frame
+    whatever the length of the meeting.
+    """
+    path = archive_path(files)
+    with contextlib.ExitStack() as stack:
+        logs = {
+            view: read_log(stack.enter_context(open(files[view], encoding="utf-8")))
+            for view in VIEWS
+        }
+        writer = TranscriptArchiveWriter(path, {view: logs[view][0] for view in VIEWS})
+        # Inputs are stored right after the last block they reference
+        try:
+            upcoming = _Upcoming(_block_records(logs["forensic"][1], logs["live"][1]))
+            for meta, payload in logs["ai_input"][1]:
+                template, taken = input_template(payload, upcoming)
+                for block in taken:
+                    writer.add(block)
+                writer.add({"kind": "input", "meta": meta, "template": template})
+            while upcoming.head is not None:
+                writer.add(upcoming.pop())
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+    archive = TranscriptArchive(path)
+    for view in VIEWS:
+        with open(files[view], encoding="utf-8") as f:
+            comparer = _LogComparer(f)
+            archive.render(view, comparer)
+            if not comparer.finished():
+                os.remove(path)
+                raise ArchiveError(f"{view} view does not round-trip")
+
+    if remove_logs:
+        for view in VIEWS:
+            os.remove(files[view])
+    return path
+
+
+def meeting_log_files(folder):
+    # Log triples of a meeting folder, keyed like generate_file_paths()
+    found = []
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith("_RAW_FORENSE.txt"):
+            continue
+        prefix = os.path.join(folder, name[: -len("_RAW_FORENSE.txt")])
+        files = {
+            "forensic": f"{prefix}_RAW_FORENSE.txt",
+            "live": f"{prefix}_LOG_VIVO.txt",
+            "ai_input": f"{prefix}_IA_INPUT.txt",
+        }
+        if all(os.path.exists(path) for path in files.values()):
+            found.append(files)
+    return found
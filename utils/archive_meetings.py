@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_archive import (  # noqa: E402
+    VIEWS,
+    ArchiveError,
+    TranscriptArchive,
+    archive_meeting,
+    meeting_log_files,
+)
+
+OUTPUT_DIR = "reuniones_logs"
+
+
+def meeting_folders(root):
+    # Meeting folders only: frames/, .llm_cache/ and .journal/ are skipped
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not name.startswith(".") and name != "frames":
+            yield path
+
+
+def convert(folders, keep_logs):
+    before = after = 0
+    for folder in folders:
+        for files in meeting_log_files(folder):
+            size = sum(os.path.getsize(path) for path in files.values())
+            try:
+                path = archive_meeting(files, remove_logs=not keep_logs)
+            except (ArchiveError, OSError) as e:
+                print(f"⚠️ {os.path.basename(folder)}: kept as text ({e})")
+                continue
+            before += size
+            after += os.path.getsize(path)
+            print(
+                f"📦 {os.path.basename(path)}: {size / 1024:.0f} KB -> "
+                f"{os.path.getsize(path) / 1024:.0f} KB"
+            )
+    if before:
+        print(
+            f"✅ {before / 1024:.0f} KB -> {after / 1024:.0f} KB ({after / before:.0%})"
+        )
+
+
+def show(path, ts, view):
+    archive = TranscriptArchive(path)
+    if ts is None:
+        print("Timestamps:", " ".join(archive.timestamps))
+        return
+    blocks = list(archive.blocks_at(ts))
+    if not blocks:
+        print(f"No blocks at {ts}")
+    for record in blocks:
+        print(f"{record['meta']}\n{archive.render_block(record, view)}\n")
+
+
+def extract(path, view, output):
+    archive = TranscriptArchive(path)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            archive.render(view, f)
+    else:
+        archive.render(view, sys.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack meeting logs into compressed transcript archives"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("convert", help="archive existing meeting folders")
+    pack.add_argument(
+        "folders", nargs="*", help=f"default: every folder in {OUTPUT_DIR}"
+    )
+    pack.add_argument("--keep-logs", action="store_true", help="keep the .txt logs")
+
+    look = commands.add_parser("show", help="blocks at one HH:MM timestamp")
+    look.add_argument("archive")
+    look.add_argument("--ts", help="HH:MM (omit to list timestamps)")
+    look.add_argument("--view", choices=("forensic", "live"), default="forensic")
+
+    dump = commands.add_parser("extract", help="rebuild a full log view")
+    dump.add_argument("archive")
+    dump.add_argument("--view", choices=VIEWS, default="forensic")
+    dump.add_argument("-o", "--output", help="file to write (default: stdout)")
+
+    args = parser.parse_args()
+    if args.command == "convert":
+        convert(args.folders or list(meeting_folders(OUTPUT_DIR)), args.keep_logs)
+    elif args.command == "show":
+        show(args.archive, args.ts, args.view)
+    else:
+        extract(args.archive, args.view, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import os
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main_meeting_ai as mma  # noqa: E402
+import teams_stream_capture as tsc  # noqa: E402
+from caption_sources import ReplayCaptionSource  # noqa: E402
+from fake_llm_server import (  # noqa: E402
+    FakeLLMServer,
+    add_server_arguments,
+    config_from_args,
+)
+
+SYNTHETIC_LINE = (
+    "el deploy del pipeline quedó pendiente para la próxima daily del equipo"
+)
+
+
+def synthetic_packets(count, words):
+    line_words = SYNTHETIC_LINE.split()
+    packets = []
+    context = ""
+    for index in range(count):
+        text = " ".join(line_words[i % len(line_words)] for i in range(words))
+        raw = f"[Ana]: bloque {index} {text}"
+        payload = "=== REUNIÓN: Bench ===\n"
+        if context:
+            payload += f"--- CONTEXTO PREVIO ---\n...{context}\n"
+        payload += f"--- SEGMENTO ACTUAL ({words} palabras) ---\n{raw}"
+        packets.append(
+            {
+                "raw_forensic": raw,
+                "live_clean": raw,
+                "ai_payload": payload,
+                "prompt_tokens": mma.token_budget.count_tokens(payload),
+                "previous_context": context,
+                "hints": [],
+                "meeting_name": "Bench",
+            }
+        )
+        context = " ".join(text.split()[-tsc.CONTEXT_OVERLAP :])
+    return packets
+
+
+def replayed_packets(path):
+    packets = []
+    source = ReplayCaptionSource(path)
+    tsc.start_headless_capture(
+        packets.append, lambda _view: None, threading.Event(), source=source
+    )
+    return packets
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(packets, rate_per_min):
+    # Unique labels map every GUI entry and request back to its blocks
+    for index, packet in enumerate(packets):
+        packet["ts"] = f"#{index:04d}"
+        packet["seq"] = index
+        packet["meeting_id"] = "bench"
+        packet["meta_header"] = f"--- BLOQUE #{index:04d} ---"
+    payload_to_label = {p["ai_payload"]: p["ts"] for p in packets}
+
+    enqueued = {}
+    call_started = {}
+    written = {}
+
+    real_process = mma.process_smart_segment
+
+    def timed_process(client, payload, *args, **kwargs):
+        started = time.perf_counter()
+        labels = re.findall(r"^--- SEGMENTO \d+ \((#\d{4}),", payload, re.MULTILINE)
+        for label in labels or [payload_to_label.get(payload)]:
+            call_started.setdefault(label, started)
+        return real_process(client, payload, *args, **kwargs)
+
+    mma.process_smart_segment = timed_process
+    finished = threading.Event()
+
+    def drain_gui():
+        while not finished.is_set():
+            try:
+                action, data = mma.gui_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if action == "ai_new":
+                now = time.perf_counter()
+                # Merged entries are labelled "#0003–#0007"
+                numbers = [int(n) for n in re.findall(r"#(\d{4})", data.split("\n")[0])]
+                for number in range(min(numbers), max(numbers) + 1) if numbers else []:
+                    written.setdefault(f"#{number:04d}", now)
+            elif action == "shutdown_complete":
+                finished.set()
+
+    threading.Thread(target=drain_gui, daemon=True).start()
+    worker = threading.Thread(target=mma.ai_worker, args=("Bench",), daemon=True)
+    worker.start()
+
+    started = time.perf_counter()
+    interval = 60.0 / rate_per_min if rate_per_min else 0.0
+    for index, packet in enumerate(packets):
+        if interval:
+            time.sleep(max(0.0, started + index * interval - time.perf_counter()))
+        enqueued[packet["ts"]] = time.perf_counter()
+        mma.text_process_queue.put(packet)
+
+    stop_at = time.perf_counter()
+    mma.ai_stop_event.set()
+    finished.wait()
+    done_at = time.perf_counter()
+    mma.process_smart_segment = real_process
+
+    labels = [p["ts"] for p in packets]
+    last_minute = max(written.values()) if written else stop_at
+    return {
+        "blocks": len(labels),
+        "written": len(written),
+        "elapsed": last_minute - started,
+        "queue_wait": [
+            call_started[l] - enqueued[l] for l in labels if l in call_started
+        ],
+        "latency": [written[l] - enqueued[l] for l in labels if l in written],
+        "drain": max(0.0, last_minute - stop_at),
+        "shutdown": done_at - stop_at,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive ai_worker against a fake LLM server and report throughput"
+    )
+    parser.add_argument("--recording", help="frames_*.jsonl.gz to build packets from")
+    parser.add_argument("--blocks", type=int, default=20, help="synthetic blocks")
+    parser.add_argument("--words", type=int, default=350, help="words per block")
+    parser.add_argument(
+        "--rate", type=float, default=0, help="blocks/min arriving (0 = all at once)"
+    )
+    parser.add_argument("--in-flight", type=int, default=mma.AI_MAX_IN_FLIGHT)
+    parser.add_argument("--no-stream", action="store_true", help="plain completions")
+    parser.add_argument(
+        "--rerun",
+        action="store_true",
+        help="process the blocks again, all at once, with the cache of the first run",
+    )
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(config_from_args(args)).start()
+    output_dir = tempfile.mkdtemp(prefix="bench_ai_")
+    mma.LM_STUDIO_URL = server.base_url
+    mma.OUTPUT_DIR = output_dir
+    mma.AI_MAX_IN_FLIGHT = args.in_flight
+    mma.STREAM_SEGMENT_MINUTES = not args.no_stream
+    # Every block must reach the server, unless the rerun checks the cache
+    mma.llm_cache.enabled = args.rerun
+    mma.llm_cache.folder = os.path.join(output_dir, ".llm_cache")
+    mma.search_index.path = os.path.join(output_dir, "meetings.sqlite3")
+
+    if args.recording:
+        packets = replayed_packets(args.recording)
+    else:
+        packets = synthetic_packets(args.blocks, args.words)
+
+    print(
+        f"🧪 {len(packets)} blocks | server: {args.slots} slots, TTFT {args.ttft}s, "
+        f"{args.tps} tok/s, fail {args.fail_rate:.0%} | in flight {args.in_flight}"
+    )
+    rerun = None
+    try:
+        r = run(packets, args.rate)
+        requests = server.requests
+        if args.rerun:
+            mma.ai_stop_event.clear()
+            rerun = run(packets, 0)
+    finally:
+        server.stop()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    minutes = r["elapsed"] / 60
+    print(
+        f"✅ {r['written']}/{r['blocks']} blocks written | "
+        f"{r['blocks'] / minutes if minutes else 0:.1f} blocks/min | "
+        f"{requests} requests ({server.failures} failed, "
+        f"{server.rejections} rejected) | "
+        f"{server.prompt_chars / 1000:.0f}k prompt chars"
+    )
+    print(
+        f"   queue wait p50 {percentile(r['queue_wait'], 0.5):.2f}s "
+        f"p95 {percentile(r['queue_wait'], 0.95):.2f}s | "
+        f"latency p50 {percentile(r['latency'], 0.5):.2f}s "
+        f"p95 {percentile(r['latency'], 0.95):.2f}s"
+    )
+    print(
+        f"   drain after stop {r['drain']:.2f}s | "
+        f"shutdown incl. summary {r['shutdown']:.2f}s"
+    )
+    if rerun is not None:
+        print(
+            f"♻️ Rerun: {rerun['written']}/{rerun['blocks']} blocks written | "
+            f"{server.requests - requests} requests"
+        )
+
+
+if __name__ == "__main__":
+    main()
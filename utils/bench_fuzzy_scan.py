@@ -0,0 +1,95 @@
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+from glossary_engine import FuzzyTermIndex  # noqa: E402
+
+BLOCKS = 10
+BLOCK_WORDS = 350
+SYNTHETIC_KEYS = [0, 500, 2000]
+GLOSSARY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "technical_glossary.json",
+)
+FILLER = (
+    "bueno entonces revisamos el despliegue del servicio porque quedó pendiente "
+    "la validación con el equipo y mañana hacemos la demostración final"
+).split()
+
+
+def legacy_scan(text, keys):
+    # Implementation before the index: every word against every key
+    matches = set()
+    words = re.findall(r"\b[a-zA-Záéíóúñ]{4,}\b", text)
+    for word in words:
+        for key in keys:
+            if word.lower() == key.lower():
+                continue
+            ratio = SequenceMatcher(None, word.lower(), key.lower()).ratio()
+            if ratio >= tsc.FUZZY_THRESHOLD:
+                matches.add((word, key))
+    return matches
+
+
+def mutate(word, rng):
+    # Phonetic-ish typo: swap one letter so some words land near a key
+    if len(word) < 4:
+        return word
+    pos = rng.randrange(len(word))
+    return word[:pos] + rng.choice(string.ascii_lowercase) + word[pos + 1 :]
+
+
+def make_blocks(keys, rng):
+    blocks = []
+    for _ in range(BLOCKS):
+        words = []
+        for _ in range(BLOCK_WORDS):
+            if rng.random() < 0.1:
+                words.append(mutate(rng.choice(keys), rng))
+            else:
+                words.append(rng.choice(FILLER))
+        blocks.append(" ".join(words))
+    return blocks
+
+
+def main():
+    rng = random.Random(7)
+    with open(GLOSSARY_PATH, "r", encoding="utf-8") as f:
+        base_keys = list(json.load(f).keys())
+
+    print(f"{'keys':>6} | {'legacy/block':>13} | {'index/block':>12} | speedup")
+    for extra in SYNTHETIC_KEYS:
+        keys = base_keys + [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+            for _ in range(extra)
+        ]
+        blocks = make_blocks(keys, rng)
+        index = FuzzyTermIndex(keys, tsc.FUZZY_THRESHOLD)
+
+        started = time.perf_counter()
+        expected = [legacy_scan(block, keys) for block in blocks]
+        legacy = (time.perf_counter() - started) / BLOCKS
+
+        started = time.perf_counter()
+        actual = [
+            index.scan(re.findall(r"\b[a-zA-Záéíóúñ]{4,}\b", block)) for block in blocks
+        ]
+        indexed = (time.perf_counter() - started) / BLOCKS
+
+        assert actual == expected, "index results differ from the legacy scan"
+        print(
+            f"{len(keys):>6} | {legacy * 1000:>10.1f} ms | {indexed * 1000:>9.2f} ms | "
+            f"{legacy / indexed:>6.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
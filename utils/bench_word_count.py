@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+from caption_sources import CaptionSource  # noqa: E402
+
+TICKS = 2000
+BLOCK_SIZES = [0, 50, 100, 200, 350, 700, 1400]
+LINE = "el deploy del pipeline quedó pendiente para la próxima daily del equipo"
+
+
+class IdleSource(CaptionSource):
+    def read(self):
+        return None, None
+
+
+def legacy_count_words(recorder):
+    # Implementation before the running counters, kept for comparison
+    full_text = " ".join(recorder.committed_lines) + " " + recorder.active_line
+    return len(full_text.split())
+
+
+def make_recorder(words):
+    recorder = tsc.TeamsRecorderSmart(IdleSource())
+    recorder.active_speaker = "Ana"
+    while recorder._count_words() < words:
+        recorder._set_active_line(LINE)
+        recorder._commit_active_line()
+    recorder._set_active_line(LINE)
+    return recorder
+
+
+def per_tick_us(func):
+    started = time.perf_counter()
+    for _ in range(TICKS):
+        func()
+    return (time.perf_counter() - started) / TICKS * 1e6
+
+
+def main():
+    # Keep the thresholds out of reach so check_snapshot never commits
+    tsc.WORD_THRESHOLD = tsc.MIN_WORDS_FOR_TIMEOUT = 10**9
+
+    print(
+        f"{'words':>6} | {'legacy count':>13} | {'running count':>13} | check_snapshot"
+    )
+    for size in BLOCK_SIZES:
+        recorder = make_recorder(size)
+        assert legacy_count_words(recorder) == recorder._count_words()
+        legacy = per_tick_us(lambda: legacy_count_words(recorder))
+        running = per_tick_us(recorder._count_words)
+        snapshot = per_tick_us(recorder.check_snapshot)
+        print(
+            f"{recorder._count_words():>6} | {legacy:>10.2f} us | "
+            f"{running:>10.2f} us | {snapshot:>7.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
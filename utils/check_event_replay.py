@@ -0,0 +1,119 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+from caption_sources import CaptionChangeNotifier, ReplayCaptionSource  # noqa: E402
+
+WORDS = (
+    "el deploy del servicio de pagos queda para el jueves porque falta revisar "
+    "la migracion de la base de datos y el equipo de infraestructura pidio mas "
+    "tiempo para validar los certificados del balanceador antes de abrir trafico"
+).split()
+
+
+class FakeNotifier(CaptionChangeNotifier):
+    """Claims every container is subscribed, so the capture loop never polls."""
+
+    def __init__(self):
+        super().__init__()
+        self.watch_calls = 0
+
+    def watch(self, targets):
+        self.watch_calls += 1
+        return True
+
+
+def write_recording(path, minutes, seed):
+    # Captions that grow word by word, with pauses between sentences
+    rng = random.Random(seed)
+    t = 0.0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"v": 1, "start": 1700000000.0}) + "\n")
+        while t < minutes * 60:
+            speaker = rng.choice(["Ana Torres", "Luis Vega", "Marta Ruiz"])
+            words = []
+            for _ in range(rng.randint(6, 30)):
+                words.append(rng.choice(WORDS))
+                t += rng.uniform(0.2, 0.6)
+                record = {"t": round(t, 3), "s": speaker, "x": " ".join(words)}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            t += rng.uniform(0.5, 25.0)
+
+
+def run(path, notifier, timeout):
+    source = ReplayCaptionSource(path)
+    blocks = []
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=tsc.start_headless_capture,
+        args=(blocks.append, None, stop),
+        kwargs={"source": source, "notifier": notifier},
+        daemon=True,
+    )
+    started = time.perf_counter()
+    thread.start()
+    thread.join(timeout)
+    elapsed = time.perf_counter() - started
+    if thread.is_alive():
+        stop.set()
+        thread.join(5)
+        return None, elapsed, source
+    return blocks, elapsed, source
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a recording with a fake change notifier and compare with polling"
+    )
+    parser.add_argument(
+        "recording", nargs="?", help="frames_*.jsonl.gz (default: synthetic)"
+    )
+    parser.add_argument("--minutes", type=float, default=20, help="synthetic length")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.recording
+        if path is None:
+            path = os.path.join(tmp, "frames_synthetic.jsonl.gz")
+            write_recording(path, args.minutes, seed=7)
+
+        polled, poll_s, _ = run(path, None, args.timeout)
+        notifier = FakeNotifier()
+        evented, event_s, source = run(path, notifier, args.timeout)
+
+    if evented is None:
+        print(
+            f"❌ Event-driven replay did not finish in {args.timeout:.0f}s "
+            f"(frame {source.position}/{len(source.frames)})"
+        )
+        sys.exit(1)
+    if polled is None:
+        print(f"❌ Polling replay did not finish in {args.timeout:.0f}s")
+        sys.exit(1)
+
+    # Silence timeouts are checked at the fallback interval instead of every
+    # poll, so block boundaries may move; the transcript itself must not
+    def words(blocks):
+        return [word for payload in blocks for word in payload["raw_forensic"].split()]
+
+    same = words(polled) == words(evented)
+    print(
+        f"{'✅' if same else '❌'} poll {len(polled)} blocks in {poll_s:.2f}s | "
+        f"events {len(evented)} blocks in {event_s:.2f}s "
+        f"({notifier.watch_calls} ticks) | {len(words(evented))} words"
+    )
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
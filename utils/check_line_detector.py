@@ -0,0 +1,110 @@
+import argparse
+import glob
+import os
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+from caption_sources import ReplayCaptionSource  # noqa: E402
+
+# Committed sample recordings plus any local recordings of real meetings
+DEFAULT_CORPUS = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "*.jsonl.gz"),
+    os.path.join("reuniones_logs", "frames", "*.jsonl.gz"),
+)
+
+
+def reference_classify(norm_active, norm_new):
+    # The detector before the incremental version: substring test, then the
+    # full ratio over both lines (Cases A, B and C)
+    if norm_active in norm_new:
+        return tsc.LINE_GROWTH
+    if len(norm_new) > 0 and len(norm_active) > 0:
+        similarity = SequenceMatcher(None, norm_active, norm_new).ratio()
+        if similarity > tsc.CORRECTION_SIMILARITY:
+            return tsc.LINE_CORRECTION
+    return tsc.LINE_NEW
+
+
+def reference_normalize(text):
+    # Normalization as it ran before: both lines, a new table on every frame
+    if not text:
+        return ""
+    translator = str.maketrans("", "", string.punctuation)
+    return " ".join(text.translate(translator).lower().split())
+
+
+def check_recording(path, show):
+    fast_classify = tsc.classify_line_change
+    result = {"checked": 0, "mismatches": 0, "reference_s": 0.0, "fast_s": 0.0}
+
+    def compare(norm_active, norm_new):
+        # Times the whole per-frame step: normalizing and classifying
+        raw_new = recorder.last_raw_capture.split("|", 1)[1]
+        started = time.perf_counter()
+        expected = reference_classify(
+            reference_normalize(recorder.active_line), reference_normalize(raw_new)
+        )
+        result["reference_s"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = fast_classify(
+            recorder.norm_active_line, recorder._normalize_text(raw_new)
+        )
+        result["fast_s"] += time.perf_counter() - started
+
+        result["checked"] += 1
+        if actual != expected:
+            result["mismatches"] += 1
+            if show:
+                print(
+                    f"  ❌ {expected} != {actual}\n     {norm_active!r}\n     {norm_new!r}"
+                )
+        return actual
+
+    source = ReplayCaptionSource(path)
+    recorder = tsc.TeamsRecorderSmart(source)
+    tsc.classify_line_change = compare
+    try:
+        while not source.exhausted:
+            recorder.update()
+            recorder.check_snapshot()
+            source.wait(tsc.POLL_INTERVAL)
+    finally:
+        tsc.classify_line_change = fast_classify
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the active-line detector against a full-ratio reference"
+    )
+    parser.add_argument("recordings", nargs="*", help="frames_*.jsonl.gz files")
+    parser.add_argument("--show", action="store_true", help="print every mismatch")
+    args = parser.parse_args()
+
+    paths = args.recordings or [
+        path for pattern in DEFAULT_CORPUS for path in sorted(glob.glob(pattern))
+    ]
+    if not paths:
+        print(f"❌ No recordings found ({', '.join(DEFAULT_CORPUS)})")
+        sys.exit(1)
+
+    failed = False
+    for path in paths:
+        r = check_recording(path, args.show)
+        failed = failed or r["mismatches"] > 0
+        print(
+            f"{'✅' if not r['mismatches'] else '❌'} {os.path.basename(path)}: "
+            f"{r['checked']} changes, {r['mismatches']} mismatches | "
+            f"reference {r['reference_s'] * 1000:.1f} ms, fast {r['fast_s'] * 1000:.1f} ms"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minute text the fake model "generates", one word per token
+FILLER = (
+    "**> 📖 Narrativa Técnica Detallada:** * Se revisó el deploy del pipeline "
+    "y la migración a v3 quedó pendiente para la próxima daily del equipo. "
+    "**> ✅ Acuerdos y Pendientes:** * [Tarea]: validar json del backlog."
+).split()
+
+
+class FakeLLMConfig:
+    def __init__(
+        self,
+        ttft=0.5,
+        tokens_per_second=40.0,
+        output_tokens=150,
+        failure_rate=0.0,
+        reject_rate=0.0,
+        slots=1,
+        model="local-model",
+    ):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.failure_rate = failure_rate
+        self.reject_rate = reject_rate
+        self.slots = slots
+        self.model = model
+
+
+class FakeLLMServer:
+    """
+    OpenAI-compatible stand-in for LM Studio: GET /v1/models and
+    POST /v1/chat/completions (plain and SSE streaming).
+
+    Requests beyond `slots` wait for a free slot like a real server queue.
+    Each generation waits `ttft` seconds, then emits `output_tokens` words at
+    `tokens_per_second`. `failure_rate` of requests answer HTTP 500 and
+    `reject_rate` of payloads answer HTTP 400 every time they are sent, like
+    a prompt over the context length.
+    Multi-segment payloads get one "=== SEGMENTO N ===" section per segment.
+    """
+
+    def __init__(self, config, host="127.0.0.1", port=0):
+        self.config = config
+        self.slots = threading.Semaphore(config.slots)
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.rejections = 0
+        self.prompt_chars = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _answer_words(self, messages):
+        payload = messages[-1]["content"] if messages else ""
+        segments = len(re.findall(r"^--- SEGMENTO \d+ \(", payload, re.MULTILINE))
+        words = [FILLER[i % len(FILLER)] for i in range(self.config.output_tokens)]
+        if segments < 2:
+            return words
+        # Same total length, split evenly across the requested sections
+        per_section = max(1, len(words) // segments)
+        answer = []
+        for index in range(segments):
+            answer.append(f"\n=== SEGMENTO {index + 1} ===\n")
+            answer.extend(words[index * per_section : (index + 1) * per_section])
+        return answer
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(
+                        200,
+                        {"object": "list", "data": [{"id": server.config.model}]},
+                    )
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                messages = request.get("messages", [])
+                payload = messages[-1]["content"] if messages else ""
+                bucket = zlib.crc32(payload.encode("utf-8")) % 1000
+                if bucket < server.config.reject_rate * 1000:
+                    with server.stats_lock:
+                        server.requests += 1
+                        server.rejections += 1
+                    self._send_json(
+                        400, {"error": {"message": "fake context length exceeded"}}
+                    )
+                    return
+                with server.stats_lock:
+                    server.requests += 1
+                    server.prompt_chars += sum(len(m["content"]) for m in messages)
+                    failed = random.random() < server.config.failure_rate
+                    if failed:
+                        server.failures += 1
+                if failed:
+                    self._send_json(500, {"error": {"message": "fake failure"}})
+                    return
+
+                with server.slots:
+                    time.sleep(server.config.ttft)
+                    words = server._answer_words(messages)
+                    max_tokens = request.get("max_tokens")
+                    if max_tokens:
+                        words = words[:max_tokens]
+                    delay = 1.0 / server.config.tokens_per_second
+                    if request.get("stream"):
+                        self._stream(words, delay)
+                    else:
+                        time.sleep(delay * len(words))
+                        self._send_json(200, self._completion(words))
+
+            def _completion(self, words):
+                return {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": server.config.model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": " ".join(words),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+
+            def _chunk(self, content, finish_reason=None):
+                delta = {} if content is None else {"content": content}
+                return {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": server.config.model,
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+
+            def _write_event(self, body):
+                data = f"data: {body}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, words, delay):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, word in enumerate(words):
+                    if index:
+                        time.sleep(delay)
+                    piece = word if index == 0 else f" {word}"
+                    self._write_event(json.dumps(self._chunk(piece)))
+                self._write_event(json.dumps(self._chunk(None, "stop")))
+                self._write_event("[DONE]")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def add_server_arguments(parser):
+    parser.add_argument(
+        "--ttft", type=float, default=0.5, help="seconds to first token"
+    )
+    parser.add_argument("--tps", type=float, default=40.0, help="output tokens/second")
+    parser.add_argument("--output-tokens", type=int, default=150, help="tokens/answer")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="0..1 HTTP 500s")
+    parser.add_argument(
+        "--reject-rate", type=float, default=0.0, help="0..1 payloads answered 400"
+    )
+    parser.add_argument("--slots", type=int, default=1, help="parallel generations")
+
+
+def config_from_args(args):
+    return FakeLLMConfig(
+        ttft=args.ttft,
+        tokens_per_second=args.tps,
+        output_tokens=args.output_tokens,
+        failure_rate=args.fail_rate,
+        reject_rate=args.reject_rate,
+        slots=args.slots,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("--port", type=int, default=1234)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(config_from_args(args), port=args.port)
+    print(f"🧪 Fake LLM on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+from caption_sources import ReplayCaptionSource  # noqa: E402
+
+
+def replay(path, speed, show_blocks):
+    source = ReplayCaptionSource(path, speed=speed)
+    stats = {"blocks": 0, "words": 0, "live": 0}
+
+    def on_block(payload):
+        stats["blocks"] += 1
+        stats["words"] += len(payload["raw_forensic"].split())
+        if show_blocks:
+            print(f"{payload['meta_header']}\n{payload['live_clean']}\n")
+
+    def on_live(_text):
+        stats["live"] += 1
+
+    print(f"▶️ Replaying {len(source.frames)} frames ({source.duration / 60:.1f} min)")
+    started = time.perf_counter()
+    tsc.start_headless_capture(on_block, on_live, threading.Event(), source=source)
+    elapsed = time.perf_counter() - started
+
+    speedup = source.duration / elapsed if elapsed else 0
+    print(
+        f"✅ {stats['blocks']} blocks | {stats['words']} words | "
+        f"{stats['live']} live updates | {elapsed:.2f}s wall ({speedup:.0f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Teams captions")
+    parser.add_argument("recording", help="frames_*.jsonl.gz file")
+    parser.add_argument(
+        "--speed", type=float, default=0, help="1 = real time, N = Nx, 0 = max"
+    )
+    parser.add_argument("--blocks", action="store_true", help="print each block")
+    parser.add_argument("--profile", action="store_true", help="run under cProfile")
+    args = parser.parse_args()
+
+    if not args.profile:
+        replay(args.recording, args.speed, args.blocks)
+        return
+
+    profiler = cProfile.Profile()
+    profiler.runcall(replay, args.recording, args.speed, args.blocks)
+    stats = pstats.Stats(profiler).sort_stats("cumulative")
+    stats.print_stats("teams_stream_capture|caption_sources", 25)
+
+
+if __name__ == "__main__":
+    main()
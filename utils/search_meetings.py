@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_index  # noqa: E402
+
+OUTPUT_DIR = "reuniones_logs"
+INDEX_PATH = os.path.join(OUTPUT_DIR, ".search", "meetings.sqlite3")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search every meeting block")
+    parser.add_argument("--index", default=INDEX_PATH, help="sqlite index file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    find = commands.add_parser("query", help="ranked blocks for a question")
+    find.add_argument("text", nargs="+")
+    find.add_argument("-n", "--limit", type=int, default=10)
+    find.add_argument(
+        "--raw", action="store_true", help='FTS5 syntax ("frase exacta", NEAR, minute:)'
+    )
+
+    reindex = commands.add_parser("rebuild", help="reindex existing meeting folders")
+    reindex.add_argument("--root", default=OUTPUT_DIR)
+
+    args = parser.parse_args()
+    conn = search_index.connect(args.index)
+
+    if args.command == "rebuild":
+        started = time.perf_counter()
+        meetings, blocks = search_index.rebuild(conn, args.root)
+        print(
+            f"✅ {meetings} meetings | {blocks} blocks indexed in "
+            f"{time.perf_counter() - started:.1f}s"
+        )
+        return
+
+    started = time.perf_counter()
+    results = search_index.search(conn, " ".join(args.text), args.limit, args.raw)
+    elapsed = (time.perf_counter() - started) * 1000
+    for meeting, started_at, ts, folder, snippet, rank in results:
+        print(f"📌 {meeting} | {started_at} | ⏱️ {ts} | {folder}")
+        print(f"   {' '.join(snippet.split())}\n")
+    print(f"🔎 {len(results)} result(s) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
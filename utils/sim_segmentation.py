@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import teams_stream_capture as tsc  # noqa: E402
+
+WORKDAY_SECONDS = 8 * 3600
+
+
+def simulate(words_per_minute, base_latency, seconds_per_word, slots, adaptive):
+    # Discrete-event model: speech fills blocks, `slots` workers serve them FIFO
+    pending = []  # Finish times of blocks queued or running
+    workers = [0.0] * slots
+    policy = tsc.SegmentationPolicy(
+        backlog=lambda: sum(1 for t in pending if t > now), slots=slots
+    )
+    now = 0.0
+    delays = []
+    sizes = []
+    while now < WORKDAY_SECONDS:
+        threshold = policy.word_threshold if adaptive else tsc.WORD_THRESHOLD
+        started_speaking = now
+        now += threshold / words_per_minute * 60
+        if adaptive:
+            policy.on_block()
+
+        worker = min(range(slots), key=workers.__getitem__)
+        latency = base_latency + seconds_per_word * threshold
+        finish = max(now, workers[worker]) + latency
+        workers[worker] = finish
+        pending = [t for t in pending if t > now] + [finish]
+        policy.report_latency(latency)
+
+        # Speech-to-minute delay of the first word in the block
+        delays.append(finish - started_speaking)
+        sizes.append(threshold)
+    return delays, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate a workday of blocks against a model of a given speed"
+    )
+    parser.add_argument("--wpm", type=float, default=150, help="speech words/minute")
+    parser.add_argument("--base", type=float, default=60, help="seconds per call")
+    parser.add_argument("--per-word", type=float, default=0.1, help="seconds/word")
+    parser.add_argument("--slots", type=int, default=1, help="parallel AI requests")
+    args = parser.parse_args()
+
+    for adaptive in (False, True):
+        delays, sizes = simulate(
+            args.wpm, args.base, args.per_word, args.slots, adaptive
+        )
+        last_hour = delays[-max(1, len(delays) // 8) :]
+        print(
+            f"{'adaptive' if adaptive else 'fixed   '} | {len(delays):>4} blocks | "
+            f"words {min(sizes)}-{max(sizes)} | max delay {max(delays) / 60:6.1f} min | "
+            f"last hour avg {sum(last_hour) / len(last_hour) / 60:6.1f} min"
+        )
+
+
+if __name__ == "__main__":
+    main()